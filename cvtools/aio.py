@@ -0,0 +1,199 @@
+import asyncio
+import functools
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from cvtools import camera, color, filters
+
+
+class AsyncProcessor:
+    """
+    Ejecuta las operaciones de cvtools sin bloquear el event loop de asyncio.
+
+    El trabajo se delega a un pool de hilos o de procesos y la cantidad de
+    operaciones en vuelo se limita con un semáforo: cuando el límite se alcanza,
+    los llamadores esperan (backpressure) en lugar de encolar trabajo sin fin.
+
+    Args:
+        executor (str | Executor): "thread", "process" o un Executor ya creado
+            (en ese caso no se cierra al terminar)
+        max_workers (int): Número de hilos/procesos del pool creado
+        max_concurrency (int): Máximo de operaciones en vuelo. Por defecto igual
+            a max_workers (o al tamaño del pool)
+    """
+
+    def __init__(self, executor: str | Executor = "thread", max_workers: int | None = None,
+                 max_concurrency: int | None = None):
+        if isinstance(executor, Executor):
+            self._executor = executor
+            self._propio = False
+        elif executor == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=max_workers)
+            self._propio = True
+        elif executor == "process":
+            self._executor = ProcessPoolExecutor(max_workers=max_workers)
+            self._propio = True
+        else:
+            raise ValueError("El executor debe ser 'thread', 'process' o una instancia de Executor")
+
+        if max_concurrency is None:
+            max_concurrency = max_workers or getattr(self._executor, "_max_workers", None) or 1
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency debe ser al menos 1")
+
+        self.max_concurrency = max_concurrency
+        self._semaforo = asyncio.Semaphore(max_concurrency)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await asyncio.to_thread(self.close)
+
+    def close(self) -> None:
+        """
+        Cierra el pool si fue creado por este procesador.
+        """
+        if self._propio:
+            self._executor.shutdown(wait=True)
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Ejecuta func(*args, **kwargs) en el pool respetando el límite de concurrencia.
+
+        Con executor="process" la función y sus argumentos deben poder serializarse
+        con pickle (las funciones de cvtools y las imágenes PIL/NumPy lo cumplen).
+        """
+        async with self._semaforo:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def process_many(self, func, items, *args, **kwargs):
+        """
+        Aplica func a cada elemento de items y entrega los resultados según terminan.
+
+        Solo se mantienen max_concurrency tareas en vuelo; el resto de items no se
+        consume hasta que haya espacio, así que items puede ser un generador largo.
+
+        Args:
+            func: Operación a aplicar (ej. filters.canny)
+            items: Iterable con el primer argumento de cada llamada
+            *args, **kwargs: Argumentos adicionales comunes a todas las llamadas
+
+        Yields:
+            tuple: (índice del item, resultado), en orden de finalización
+        """
+        pendientes = {}
+        iterador = iter(enumerate(items))
+        agotado = False
+
+        try:
+            while True:
+                while not agotado and len(pendientes) < self.max_concurrency:
+                    try:
+                        indice, item = next(iterador)
+                    except StopIteration:
+                        agotado = True
+                        break
+                    tarea = asyncio.ensure_future(self.run(func, item, *args, **kwargs))
+                    pendientes[tarea] = indice
+
+                if not pendientes:
+                    return
+
+                listas, _ = await asyncio.wait(pendientes, return_when=asyncio.FIRST_COMPLETED)
+                for tarea in listas:
+                    indice = pendientes.pop(tarea)
+                    yield indice, tarea.result()
+        finally:
+            for tarea in pendientes:
+                tarea.cancel()
+            if pendientes:
+                await asyncio.gather(*pendientes, return_exceptions=True)
+
+    # --- Variantes asíncronas de las operaciones principales ---
+
+    async def convolucion(self, imagen, kernel: np.ndarray, backend: str | None = None) -> np.ndarray:
+        return await self.run(filters.convolucion, imagen, kernel, backend)
+
+    async def sobel_x(self, imagen, backend: str | None = None) -> np.ndarray:
+        return await self.run(filters.sobel_x, imagen, backend)
+
+    async def sobel_y(self, imagen, backend: str | None = None) -> np.ndarray:
+        return await self.run(filters.sobel_y, imagen, backend)
+
+    async def canny(self, imagen, umbral_bajo: int = 50, umbral_alto: int = 150,
+                    backend: str | None = None) -> np.ndarray:
+        return await self.run(filters.canny, imagen, umbral_bajo, umbral_alto, backend)
+
+    async def filtro_laplaciano(self, imagen, backend: str | None = None) -> np.ndarray:
+        return await self.run(filters.filtro_laplaciano, imagen, backend)
+
+    async def apply_radial_distortion(self, image: np.ndarray, k1: float = 0.0, k2: float = 0.0,
+                                      **kwargs) -> np.ndarray:
+        return await self.run(camera.apply_radial_distortion, image, k1, k2, **kwargs)
+
+    async def apply_focal_distortion(self, image: np.ndarray, new_focal_length: float,
+                                     original_focal_length: float = 1.0, **kwargs) -> np.ndarray:
+        return await self.run(camera.apply_focal_distortion, image, new_focal_length,
+                              original_focal_length, **kwargs)
+
+    async def cuantizacion_simple(self, imagen, niveles: int):
+        return await self.run(color.cuantizacion_simple, imagen, niveles)
+
+    async def reducir_peso(self, imagen, niveles: int, formato: str = "JPEG"):
+        return await self.run(color.reducir_peso, imagen, niveles, formato)
+
+
+async def load_test(processor: AsyncProcessor, func, items, *args, clients: int = 8,
+                    percentiles: tuple = (50, 90, 95, 99), **kwargs) -> dict:
+    """
+    Servicio local de prueba: simula clientes concurrentes y mide latencias.
+
+    Cada cliente toma el siguiente item disponible y espera su resultado antes de
+    pedir otro. La latencia incluye la espera en el semáforo del procesador, igual
+    que la vería un cliente de un servicio real.
+
+    Args:
+        processor (AsyncProcessor): Procesador a evaluar
+        func: Operación a ejecutar por petición (ej. filters.canny)
+        items: Iterable con el primer argumento de cada petición
+        clients (int): Número de clientes concurrentes
+        percentiles (tuple): Percentiles de latencia a reportar
+
+    Returns:
+        dict: {"peticiones", "duracion_s", "rendimiento_rps", "p50_ms", ...}
+    """
+    cola = asyncio.Queue()
+    for item in items:
+        cola.put_nowait(item)
+
+    latencias = []
+
+    async def cliente():
+        while True:
+            try:
+                item = cola.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            inicio = time.perf_counter()
+            await processor.run(func, item, *args, **kwargs)
+            latencias.append(time.perf_counter() - inicio)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente() for _ in range(clients)))
+    duracion = time.perf_counter() - inicio
+
+    resultado = {
+        "peticiones": len(latencias),
+        "duracion_s": duracion,
+        "rendimiento_rps": len(latencias) / duracion if duracion > 0 else 0.0,
+    }
+    if latencias:
+        valores = np.percentile(np.array(latencias) * 1000, percentiles)
+        for p, valor in zip(percentiles, valores):
+            resultado[f"p{p}_ms"] = float(valor)
+
+    return resultado
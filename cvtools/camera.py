@@ -1,31 +1,13 @@
 import numpy as np
 import cv2
 
-def apply_radial_distortion(image: np.ndarray, k1: float = 0.0, k2: float = 0.0, 
-                           interpolation: int = cv2.INTER_LINEAR, 
-                           border_mode: int = cv2.BORDER_CONSTANT) -> np.ndarray:
+from cvtools.workspace import Workspace, preparar_salida
+
+
+def _radial_maps(height: int, width: int, k1: float, k2: float) -> tuple:
     """
-    Aplica distorsión radial a una imagen usando el modelo de distorsión de lente.
-    
-    Args:
-        image (np.ndarray): Imagen de entrada como array NumPy
-        k1 (float): Primer coeficiente de distorsión radial
-        k2 (float): Segundo coeficiente de distorsión radial
-        interpolation (int): Método de interpolación
-        border_mode (int): Método para manejar bordes
-    
-    Returns:
-        np.ndarray: Imagen con distorsión radial aplicada
+    Calcula los mapas de remapeo (map_x, map_y) de la distorsión radial.
     """
-    if not isinstance(image, np.ndarray):
-        raise TypeError("La imagen debe ser un array NumPy")
-    
-    if image.size == 0:
-        raise ValueError("La imagen de entrada está vacía")
-    
-    # Obtener dimensiones de la imagen
-    height, width = image.shape[:2]
-    
     # Crear coordenadas normalizadas del plano de la imagen
     cx, cy = width / 2.0, height / 2.0
     
@@ -57,27 +39,28 @@ def apply_radial_distortion(image: np.ndarray, k1: float = 0.0, k2: float = 0.0,
     map_x = xd.astype(np.float32)
     map_y = yd.astype(np.float32)
     
-    # Aplicar la transformación usando remapeo
-    distorted_image = cv2.remap(image, map_x, map_y, interpolation, borderMode=border_mode)
-    
-    return distorted_image
+    return map_x, map_y
 
-def apply_focal_distortion(image: np.ndarray, new_focal_length: float, 
-                          original_focal_length: float = 1.0, 
-                          interpolation: int = cv2.INTER_LINEAR, 
-                          border_mode: int = cv2.BORDER_CONSTANT) -> np.ndarray:
+def apply_radial_distortion(image: np.ndarray, k1: float = 0.0, k2: float = 0.0, 
+                           interpolation: int = cv2.INTER_LINEAR, 
+                           border_mode: int = cv2.BORDER_CONSTANT,
+                           out: np.ndarray | None = None,
+                           workspace: Workspace | None = None) -> np.ndarray:
     """
-    Aplica distorsión a una imagen simulando un cambio en la distancia focal.
+    Aplica distorsión radial a una imagen usando el modelo de distorsión de lente.
     
     Args:
         image (np.ndarray): Imagen de entrada como array NumPy
-        new_focal_length (float): Nueva distancia focal (unidades)
-        original_focal_length (float): Distancia focal original
+        k1 (float): Primer coeficiente de distorsión radial
+        k2 (float): Segundo coeficiente de distorsión radial
         interpolation (int): Método de interpolación
         border_mode (int): Método para manejar bordes
+        out (np.ndarray): Array donde escribir el resultado (misma forma y tipo que image)
+        workspace (Workspace): Guarda los mapas de remapeo; mientras no cambien el
+            tamaño ni los coeficientes se reutilizan en lugar de recalcularse
     
     Returns:
-        np.ndarray: Imagen con distorsión por cambio de distancia focal
+        np.ndarray: Imagen con distorsión radial aplicada
     """
     if not isinstance(image, np.ndarray):
         raise TypeError("La imagen debe ser un array NumPy")
@@ -85,16 +68,27 @@ def apply_focal_distortion(image: np.ndarray, new_focal_length: float,
     if image.size == 0:
         raise ValueError("La imagen de entrada está vacía")
     
-    if new_focal_length <= 0:
-        raise ValueError("La distancia focal debe ser positiva")
-    
-    # Si la relación es 1, no hay distorsión
-    if abs(new_focal_length - original_focal_length) < 1e-6:
-        return image.copy()
-    
     # Obtener dimensiones de la imagen
     height, width = image.shape[:2]
     
+    # Crear mapas de remapeo (o reutilizar los del workspace)
+    if workspace is None:
+        map_x, map_y = _radial_maps(height, width, k1, k2)
+    else:
+        map_x, map_y = workspace.cached("camera.radial", (height, width, k1, k2),
+                                        lambda: _radial_maps(height, width, k1, k2))
+    
+    # Aplicar la transformación usando remapeo
+    distorted_image = preparar_salida(out, image.shape, image.dtype)
+    cv2.remap(image, map_x, map_y, interpolation, dst=distorted_image, borderMode=border_mode)
+    
+    return distorted_image
+
+def _focal_maps(height: int, width: int, new_focal_length: float,
+               original_focal_length: float) -> tuple:
+    """
+    Calcula los mapas de remapeo (map_x, map_y) del cambio de distancia focal.
+    """
     # Centro de la imagen
     cx, cy = width / 2.0, height / 2.0
     
@@ -136,7 +130,58 @@ def apply_focal_distortion(image: np.ndarray, new_focal_length: float,
     map_x = xd.astype(np.float32)
     map_y = yd.astype(np.float32)
     
+    return map_x, map_y
+
+def apply_focal_distortion(image: np.ndarray, new_focal_length: float, 
+                          original_focal_length: float = 1.0, 
+                          interpolation: int = cv2.INTER_LINEAR, 
+                          border_mode: int = cv2.BORDER_CONSTANT,
+                          out: np.ndarray | None = None,
+                          workspace: Workspace | None = None) -> np.ndarray:
+    """
+    Aplica distorsión a una imagen simulando un cambio en la distancia focal.
+    
+    Args:
+        image (np.ndarray): Imagen de entrada como array NumPy
+        new_focal_length (float): Nueva distancia focal (unidades)
+        original_focal_length (float): Distancia focal original
+        interpolation (int): Método de interpolación
+        border_mode (int): Método para manejar bordes
+        out (np.ndarray): Array donde escribir el resultado (misma forma y tipo que image)
+        workspace (Workspace): Guarda los mapas de remapeo; mientras no cambien el
+            tamaño ni las distancias focales se reutilizan en lugar de recalcularse
+    
+    Returns:
+        np.ndarray: Imagen con distorsión por cambio de distancia focal
+    """
+    if not isinstance(image, np.ndarray):
+        raise TypeError("La imagen debe ser un array NumPy")
+    
+    if image.size == 0:
+        raise ValueError("La imagen de entrada está vacía")
+    
+    if new_focal_length <= 0:
+        raise ValueError("La distancia focal debe ser positiva")
+    
+    # Si la relación es 1, no hay distorsión
+    if abs(new_focal_length - original_focal_length) < 1e-6:
+        distorted_image = preparar_salida(out, image.shape, image.dtype)
+        np.copyto(distorted_image, image)
+        return distorted_image
+    
+    # Obtener dimensiones de la imagen
+    height, width = image.shape[:2]
+    
+    # Crear mapas de remapeo (o reutilizar los del workspace)
+    if workspace is None:
+        map_x, map_y = _focal_maps(height, width, new_focal_length, original_focal_length)
+    else:
+        map_x, map_y = workspace.cached(
+            "camera.focal", (height, width, new_focal_length, original_focal_length),
+            lambda: _focal_maps(height, width, new_focal_length, original_focal_length))
+    
     # Aplicar la transformación
-    distorted_image = cv2.remap(image, map_x, map_y, interpolation, borderMode=border_mode)
+    distorted_image = preparar_salida(out, image.shape, image.dtype)
+    cv2.remap(image, map_x, map_y, interpolation, dst=distorted_image, borderMode=border_mode)
     
     return distorted_image
\ No newline at end of file
@@ -1,23 +1,98 @@
 import cv2
 import numpy as np
-import matplotlib.pyplot as plt
 import io
 from PIL import Image
-from cvtools.plotting import mostrar_canales
+from cvtools.workspace import Workspace, preparar_salida
 
 
-def rgb_a_hsv(imagen_pil: Image.Image, plot: bool) -> np.ndarray:
+# Espacios de color admitidos por convertir_espacios y su código de OpenCV desde RGB
+ESPACIOS = {
+    "hsv": cv2.COLOR_RGB2HSV,
+    "lab": cv2.COLOR_RGB2LAB,
+    "yuv": cv2.COLOR_RGB2YUV,
+}
+
+
+def convertir_espacios(imagen: Image.Image | np.ndarray, espacios=("hsv", "lab", "yuv"),
+                       out: np.ndarray | None = None, workspace: Workspace | None = None) -> dict:
     """
-    Convierte una imagen de RGB a HSV usando OpenCV.
+    Convierte una imagen RGB a varios espacios de color en una sola llamada.
+
+    La imagen se pasa a NumPy una sola vez y todas las conversiones comparten
+    ese buffer RGB y un único buffer intermedio (entrelazado) del workspace.
+    Los canales de todos los espacios se escriben en un solo array planar
+    (3 * len(espacios), alto, ancho) y se retornan como vistas de ese array,
+    en lugar de copiar cada canal como cv2.split.
+
+    Parámetros:
+    -----------
+    imagen : PIL.Image o np.ndarray
+        Imagen RGB (uint8, alto x ancho x 3).
+    espacios : iterable of str
+        Espacios de destino, en orden: cualquier combinación de "hsv", "lab" y "yuv".
+    out : np.ndarray, opcional
+        Array uint8 de forma (3 * len(espacios), alto, ancho) donde escribir los canales.
+    workspace : Workspace, opcional
+        Buffers temporales reutilizables entre llamadas.
+
+    Retorna:
+    --------
+    dict
+        {espacio: [canal_0, canal_1, canal_2]}, cada canal una vista (alto, ancho) de out.
+    """
+    espacios = [espacio.lower() for espacio in espacios]
+    for espacio in espacios:
+        if espacio not in ESPACIOS:
+            raise ValueError(f"Espacio de color desconocido: {espacio!r}. "
+                             f"Disponibles: {', '.join(ESPACIOS)}")
+    if len(set(espacios)) != len(espacios):
+        raise ValueError("Los espacios de color no deben repetirse")
+
+    rgb_np = np.ascontiguousarray(imagen)  # PIL -> NumPy (RGB), una sola vez
+    if rgb_np.ndim != 3 or rgb_np.shape[2] != 3:
+        raise ValueError("La imagen debe ser RGB (alto x ancho x 3)")
+
+    workspace = Workspace() if workspace is None else workspace
+    alto, ancho = rgb_np.shape[:2]
+
+    planar = preparar_salida(out, (3 * len(espacios), alto, ancho), rgb_np.dtype)
+    convertido = workspace.get("color.convertido", rgb_np.shape, rgb_np.dtype)
+
+    canales = {}
+    for i, espacio in enumerate(espacios):
+        cv2.cvtColor(rgb_np, ESPACIOS[espacio], dst=convertido)
+
+        # Desentrelazar los tres canales de una vez en su tramo del array planar
+        tramo = planar[3 * i:3 * i + 3]
+        np.copyto(tramo, convertido.transpose(2, 0, 1))
+        canales[espacio] = list(tramo)
+
+    return canales
+
+
+def _convertir_canales(imagen: Image.Image | np.ndarray, espacio: str, out: np.ndarray | None,
+                       workspace: Workspace | None) -> list:
     """
-    rgb_np = np.array(imagen_pil)  # PIL -> NumPy (RGB)
-    hsv_np = cv2.cvtColor(rgb_np, cv2.COLOR_RGB2HSV)
+    Convierte la imagen a un solo espacio y retorna sus canales como vistas de un array (3, H, W).
+    """
+    return convertir_espacios(imagen, (espacio,), out, workspace)[espacio]
+
 
-    h, s, v = cv2.split(hsv_np)
+def rgb_a_hsv(imagen_pil: Image.Image | np.ndarray, plot: bool | None = None,
+              out: np.ndarray | None = None, workspace: Workspace | None = None) -> np.ndarray:
+    """
+    Convierte una imagen de RGB a HSV usando OpenCV.
+
+    Con plot=None no se muestra ni se imprime nada. Si se pasa out (uint8 de
+    forma (3, alto, ancho)) los canales se escriben en él y se retornan como
+    vistas; junto con un workspace, las llamadas sucesivas no reservan memoria.
+    """
+    h, s, v = _convertir_canales(imagen_pil, "hsv", out, workspace)
 
     if plot:
+        from cvtools.plotting import mostrar_canales  # matplotlib solo al graficar
         mostrar_canales([h, s, v], "HSV")
-    else:
+    elif plot is not None:
         print("Canal H:\n", h, "\n")
         print("Canal S:\n", s, "\n")
         print("Canal V:\n", v, "\n")
@@ -25,18 +100,19 @@ def rgb_a_hsv(imagen_pil: Image.Image, plot: bool) -> np.ndarray:
     return [h, s, v]
 
 
-def rgb_a_lab(imagen_pil: Image.Image, plot: bool) -> np.ndarray:
+def rgb_a_lab(imagen_pil: Image.Image | np.ndarray, plot: bool | None = None,
+              out: np.ndarray | None = None, workspace: Workspace | None = None) -> np.ndarray:
     """
     Convierte una imagen de RGB a LAB usando OpenCV.
-    """
-    rgb_np = np.array(imagen_pil)
-    lab_np = cv2.cvtColor(rgb_np, cv2.COLOR_RGB2LAB)
 
-    l, a, b = cv2.split(lab_np)
+    Admite los mismos parámetros plot, out y workspace que rgb_a_hsv.
+    """
+    l, a, b = _convertir_canales(imagen_pil, "lab", out, workspace)
 
     if plot:
+        from cvtools.plotting import mostrar_canales
         mostrar_canales([l, a, b], "LAB")
-    else:
+    elif plot is not None:
         print("Canal L:\n", l, "\n")
         print("Canal A:\n", a, "\n")
         print("Canal B:\n", b, "\n")
@@ -44,18 +120,19 @@ def rgb_a_lab(imagen_pil: Image.Image, plot: bool) -> np.ndarray:
     return [l, a, b]
 
 
-def rgb_a_yuv(imagen_pil: Image.Image, plot: bool) -> np.ndarray:
+def rgb_a_yuv(imagen_pil: Image.Image | np.ndarray, plot: bool | None = None,
+              out: np.ndarray | None = None, workspace: Workspace | None = None) -> np.ndarray:
     """
     Convierte una imagen de RGB a YUV usando OpenCV.
-    """
-    rgb_np = np.array(imagen_pil)
-    yuv_np = cv2.cvtColor(rgb_np, cv2.COLOR_RGB2YUV)
 
-    y, u, v = cv2.split(yuv_np)
+    Admite los mismos parámetros plot, out y workspace que rgb_a_hsv.
+    """
+    y, u, v = _convertir_canales(imagen_pil, "yuv", out, workspace)
 
     if plot:
+        from cvtools.plotting import mostrar_canales
         mostrar_canales([y, u, v], "YUV")
-    else:
+    elif plot is not None:
         print("Canal Y:\n", y, "\n")
         print("Canal U:\n", u, "\n")
         print("Canal V:\n", v, "\n")
@@ -82,7 +159,9 @@ def histograma_colores(imagen_pil: Image.Image):
     hist_g, _ = np.histogram(g, bins=256, range=(0, 255))
     hist_b, _ = np.histogram(b, bins=256, range=(0, 255))
 
-    # Graficar
+    # Graficar (matplotlib se importa solo aquí, no al importar el módulo)
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(10, 5))
     plt.plot(hist_r, color='red', label="Rojo")
     plt.plot(hist_g, color='green', label="Verde")
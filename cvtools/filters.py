@@ -1,54 +1,628 @@
+import functools
+import importlib.util
+
 import numpy as np
-from PIL import Image, ImageFilter
+import cv2
+from PIL import Image
+
+from cvtools.workspace import Workspace, preparar_salida
+
+# Backend JIT opcional. Importar numba cuesta cientos de milisegundos, así que
+# solo se comprueba que esté instalado; se importa al usar el backend.
+_NUMBA_INSTALADO = importlib.util.find_spec("numba") is not None
+
+
+# --- Registro de backends ---
+# Cada backend implementa las etapas internas sobre arrays NumPy. Todas escriben
+# en un array de salida ya reservado y reciben un Workspace para sus temporales:
+#   "convolucion"         (img float32 HxWxC, kernel, salida float32 HxWxC, workspace)
+#                         -> respuesta sin recortar
+#   "supresion_no_maxima" (magnitud, angulo en grados [0, 180], Z, workspace)
+#                         -> magnitudes suprimidas (Z completo, bordes en 0)
+#   "histeresis"          (mapa uint8 con FUERTE/DEBIL/0, workspace)
+#                         -> mapa final (se modifica en sitio)
+# Opcionalmente:
+#   "convolucion_entera"  (img uint8 HxWxC, kernel entero, salida int16/int32 HxWxC, workspace)
+#                         -> respuesta exacta sin recortar (ver _acumulador_entero)
+OPERACIONES = ("convolucion", "supresion_no_maxima", "histeresis")
+OPERACIONES_OPCIONALES = ("convolucion_entera",)
+
+BACKEND_REFERENCIA = "referencia"
+
+_BACKENDS = {}
+_backend_global = BACKEND_REFERENCIA
+
+# Valores del mapa de bordes de Canny
+FUERTE = 255
+DEBIL = 50
+
+
+def registrar_backend(nombre: str, operaciones: dict) -> None:
+    """
+    Registra (o reemplaza) un backend de filtros.
+
+    Parámetros:
+    -----------
+    nombre : str
+        Nombre con el que se seleccionará el backend.
+    operaciones : dict
+        Diccionario {operación: función} con una implementación para cada
+        una de las etapas listadas en OPERACIONES y, si se desea, para las de
+        OPERACIONES_OPCIONALES.
+    """
+    faltantes = [op for op in OPERACIONES if op not in operaciones]
+    if faltantes:
+        raise ValueError(f"El backend '{nombre}' no implementa: {', '.join(faltantes)}")
+
+    _BACKENDS[nombre] = {op: operaciones[op] for op in OPERACIONES + OPERACIONES_OPCIONALES
+                         if op in operaciones}
+
+
+def backends_disponibles() -> list:
+    """
+    Retorna los nombres de los backends registrados.
+    """
+    return list(_BACKENDS)
+
+
+def backend_actual() -> str:
+    """
+    Retorna el nombre del backend seleccionado globalmente.
+    """
+    return _backend_global
+
+
+def usar_backend(nombre: str) -> str:
+    """
+    Selecciona globalmente el backend usado por los filtros.
+
+    Parámetros:
+    -----------
+    nombre : str
+        Nombre de un backend registrado (ver backends_disponibles()).
+
+    Retorna:
+    --------
+    str
+        Nombre del backend seleccionado anteriormente, para poder restaurarlo.
+    """
+    global _backend_global
+
+    if nombre not in _BACKENDS:
+        raise ValueError(f"Backend desconocido: '{nombre}'. Disponibles: {backends_disponibles()}")
 
-def convolucion(imagen: Image.Image, kernel: np.ndarray) -> np.ndarray:
+    anterior = _backend_global
+    _backend_global = nombre
+    return anterior
+
+
+def _resolver_backend(backend: str | None) -> dict:
+    """
+    Obtiene las operaciones del backend pedido o, si es None, del global.
+    """
+    nombre = _backend_global if backend is None else backend
+    if nombre not in _BACKENDS:
+        raise ValueError(f"Backend desconocido: '{nombre}'. Disponibles: {backends_disponibles()}")
+    return _BACKENDS[nombre]
+
+
+def _rellenar_reflejo(img_array: np.ndarray, pad_h: int, pad_w: int, workspace: Workspace) -> np.ndarray:
+    """
+    Equivalente a np.pad(..., mode='reflect') escribiendo en un buffer del workspace.
+    """
+    alto, ancho = img_array.shape[:2]
+    if pad_h >= alto or pad_w >= ancho:
+        # Reflejo múltiple (kernel más grande que la imagen): caso poco común
+        return np.pad(img_array, ((pad_h, pad_h), (pad_w, pad_w), (0, 0)), mode='reflect')
+
+    padded = workspace.get("filters.padded", (alto + 2 * pad_h, ancho + 2 * pad_w, img_array.shape[2]),
+                           img_array.dtype)
+    padded[pad_h:pad_h + alto, pad_w:pad_w + ancho] = img_array
+
+    # Primero filas y luego columnas (sobre toda la altura), igual que np.pad
+    if pad_h:
+        padded[:pad_h] = padded[2 * pad_h:pad_h:-1]
+        padded[pad_h + alto:] = padded[pad_h + alto - 2:alto - 2:-1]
+    if pad_w:
+        padded[:, :pad_w] = padded[:, 2 * pad_w:pad_w:-1]
+        padded[:, pad_w + ancho:] = padded[:, pad_w + ancho - 2:ancho - 2:-1]
+
+    return padded
+
+
+# --- Backend de referencia (bucles explícitos) ---
+
+def _convolucion_referencia(img_array: np.ndarray, kernel: np.ndarray, salida: np.ndarray,
+                            workspace: Workspace) -> np.ndarray:
+    # Tamaño del kernel
+    k_h, k_w = kernel.shape
+    pad_h, pad_w = k_h // 2, k_w // 2
+
+    # Padding
+    padded = _rellenar_reflejo(img_array, pad_h, pad_w, workspace)
+
+    # Convolución canal por canal
+    for c in range(img_array.shape[2]):
+        for i in range(img_array.shape[0]):
+            for j in range(img_array.shape[1]):
+                region = padded[i:i + k_h, j:j + k_w, c]
+                salida[i, j, c] = np.sum(region * kernel)
+
+    return salida
+
+
+def _supresion_no_maxima_bucle(magnitud: np.ndarray, ang: np.ndarray, Z: np.ndarray) -> np.ndarray:
+    M, N = magnitud.shape
+
+    for i in range(1, M-1):
+        for j in range(1, N-1):
+            q = 255
+            r = 255
+
+            # Dirección 0
+            if (0 <= ang[i,j] < 22.5) or (157.5 <= ang[i,j] <= 180):
+                q = magnitud[i, j+1]
+                r = magnitud[i, j-1]
+            # Dirección 45
+            elif (22.5 <= ang[i,j] < 67.5):
+                q = magnitud[i+1, j-1]
+                r = magnitud[i-1, j+1]
+            # Dirección 90
+            elif (67.5 <= ang[i,j] < 112.5):
+                q = magnitud[i+1, j]
+                r = magnitud[i-1, j]
+            # Dirección 135
+            elif (112.5 <= ang[i,j] < 157.5):
+                q = magnitud[i-1, j-1]
+                r = magnitud[i+1, j+1]
+
+            if (magnitud[i,j] >= q) and (magnitud[i,j] >= r):
+                Z[i,j] = magnitud[i,j]
+            else:
+                Z[i,j] = 0
+
+    return Z
+
+
+def _supresion_no_maxima_referencia(magnitud: np.ndarray, ang: np.ndarray, Z: np.ndarray,
+                                    workspace: Workspace) -> np.ndarray:
+    Z.fill(0)
+    return _supresion_no_maxima_bucle(magnitud, ang, Z)
+
+
+def _histeresis_bucle(res: np.ndarray, fuerte: int, debil: int) -> np.ndarray:
+    M, N = res.shape
+
+    for i in range(1, M-1):
+        for j in range(1, N-1):
+            if res[i,j] == debil:
+                if ((res[i+1, j-1] == fuerte) or (res[i+1, j] == fuerte) or (res[i+1, j+1] == fuerte)
+                    or (res[i, j-1] == fuerte) or (res[i, j+1] == fuerte)
+                    or (res[i-1, j-1] == fuerte) or (res[i-1, j] == fuerte) or (res[i-1, j+1] == fuerte)):
+                    res[i,j] = fuerte
+                else:
+                    res[i,j] = 0
+
+    return res
+
+
+def _histeresis_referencia(res: np.ndarray, workspace: Workspace) -> np.ndarray:
+    return _histeresis_bucle(res, FUERTE, DEBIL)
+
+
+# --- Backend NumPy vectorizado ---
+
+def _convolucion_numpy(img_array: np.ndarray, kernel: np.ndarray, salida: np.ndarray,
+                       workspace: Workspace) -> np.ndarray:
+    k_h, k_w = kernel.shape
+    pad_h, pad_w = k_h // 2, k_w // 2
+    alto, ancho = img_array.shape[:2]
+
+    padded = _rellenar_reflejo(img_array, pad_h, pad_w, workspace)
+    producto = workspace.get("filters.producto", salida.shape, salida.dtype)
+    salida.fill(0)
+
+    # Acumular una copia desplazada de la imagen por cada coeficiente no nulo
+    for u in range(k_h):
+        for v in range(k_w):
+            if kernel[u, v] != 0:
+                np.multiply(padded[u:u + alto, v:v + ancho, :], float(kernel[u, v]), out=producto)
+                salida += producto
+
+    return salida
+
+
+def _convolucion_entera_numpy(img_array: np.ndarray, kernel: np.ndarray, salida: np.ndarray,
+                              workspace: Workspace) -> np.ndarray:
+    k_h, k_w = kernel.shape
+    pad_h, pad_w = k_h // 2, k_w // 2
+    alto, ancho = img_array.shape[:2]
+
+    # El padding se hace sobre uint8: 1 byte por píxel en lugar de 4
+    padded = _rellenar_reflejo(img_array, pad_h, pad_w, workspace)
+    producto = workspace.get("filters.producto_entero", salida.shape, salida.dtype)
+    salida.fill(0)
+
+    for u in range(k_h):
+        for v in range(k_w):
+            coeficiente = int(kernel[u, v])
+            region = padded[u:u + alto, v:v + ancho, :]
+            # Los coeficientes ±1 (frecuentes en Sobel y Laplaciano) no necesitan producto
+            if coeficiente == 1:
+                np.add(salida, region, out=salida)
+            elif coeficiente == -1:
+                np.subtract(salida, region, out=salida)
+            elif coeficiente != 0:
+                np.multiply(region, coeficiente, out=producto, dtype=salida.dtype)
+                np.add(salida, producto, out=salida)
+
+    return salida
+
+
+def _en_rango(a: np.ndarray, inferior: float, superior: float, mascara: np.ndarray,
+              auxiliar: np.ndarray, incluir_superior: bool = False) -> np.ndarray:
+    """
+    mascara = (inferior <= a < superior), o <= superior si incluir_superior, sin temporales.
+    """
+    np.greater_equal(a, inferior, out=mascara)
+    if incluir_superior:
+        np.less_equal(a, superior, out=auxiliar)
+    else:
+        np.less(a, superior, out=auxiliar)
+    np.logical_and(mascara, auxiliar, out=mascara)
+    return mascara
+
+
+def _supresion_no_maxima_numpy(magnitud: np.ndarray, ang: np.ndarray, Z: np.ndarray,
+                               workspace: Workspace) -> np.ndarray:
+    M, N = magnitud.shape
+    Z.fill(0)
+    if M < 3 or N < 3:
+        return Z
+
+    forma = (M - 2, N - 2)
+    centro = magnitud[1:-1, 1:-1]
+    a = ang[1:-1, 1:-1]
+
+    q = workspace.get("filters.nms_q", forma, magnitud.dtype)
+    r = workspace.get("filters.nms_r", forma, magnitud.dtype)
+    mascara = workspace.get("filters.nms_mascara", forma, bool)
+    auxiliar = workspace.get("filters.nms_auxiliar", forma, bool)
+    extra = workspace.get("filters.nms_extra", forma, bool)
+
+    # Los cuatro rangos de ángulo son disjuntos y cubren [0, 180], igual que la
+    # cadena if/elif de la referencia; fuera de ellos q = r = 255.
+    q.fill(255)
+    r.fill(255)
+
+    # Dirección 0
+    _en_rango(a, 0, 22.5, mascara, auxiliar)
+    _en_rango(a, 157.5, 180, extra, auxiliar, incluir_superior=True)
+    np.logical_or(mascara, extra, out=mascara)
+    np.copyto(q, magnitud[1:-1, 2:], where=mascara)
+    np.copyto(r, magnitud[1:-1, :-2], where=mascara)
+    # Dirección 45
+    _en_rango(a, 22.5, 67.5, mascara, auxiliar)
+    np.copyto(q, magnitud[2:, :-2], where=mascara)
+    np.copyto(r, magnitud[:-2, 2:], where=mascara)
+    # Dirección 90
+    _en_rango(a, 67.5, 112.5, mascara, auxiliar)
+    np.copyto(q, magnitud[2:, 1:-1], where=mascara)
+    np.copyto(r, magnitud[:-2, 1:-1], where=mascara)
+    # Dirección 135
+    _en_rango(a, 112.5, 157.5, mascara, auxiliar)
+    np.copyto(q, magnitud[:-2, :-2], where=mascara)
+    np.copyto(r, magnitud[2:, 2:], where=mascara)
+
+    np.greater_equal(centro, q, out=mascara)
+    np.greater_equal(centro, r, out=auxiliar)
+    np.logical_and(mascara, auxiliar, out=mascara)
+    np.copyto(Z[1:-1, 1:-1], centro, where=mascara)
+
+    return Z
+
+
+def _histeresis_numpy(res: np.ndarray, workspace: Workspace) -> np.ndarray:
+    M, N = res.shape
+    if M < 3 or N < 3:
+        return res
+
+    indices = np.arange(N - 2)
+
+    # La referencia recorre la imagen en orden de filas: un píxel débil ya ve
+    # como definitivos a sus vecinos de la fila anterior y al de su izquierda.
+    # Se procesa fila a fila, resolviendo la propagación hacia la derecha por
+    # tramos contiguos de píxeles débiles.
+    for i in range(1, M-1):
+        fila = res[i, 1:N-1]
+        debiles = fila == DEBIL
+        if not debiles.any():
+            continue
+
+        vecino_fuerte = ((res[i-1, :-2] == FUERTE) | (res[i-1, 1:-1] == FUERTE) | (res[i-1, 2:] == FUERTE)
+                         | (res[i+1, :-2] == FUERTE) | (res[i+1, 1:-1] == FUERTE) | (res[i+1, 2:] == FUERTE)
+                         | (res[i, :-2] == FUERTE) | (res[i, 2:] == FUERTE))
+        semillas = debiles & vecino_fuerte
+
+        # Un débil se promueve si hay una semilla en su tramo, a su izquierda o en él
+        ultima_semilla = np.maximum.accumulate(np.where(semillas, indices, -1))
+        ultimo_corte = np.maximum.accumulate(np.where(debiles, -1, indices))
+        promovidos = debiles & (ultima_semilla > ultimo_corte)
+
+        fila[debiles] = 0
+        fila[promovidos] = FUERTE
+
+    return res
+
+
+# --- Backend OpenCV ---
+
+def _convolucion_opencv(img_array: np.ndarray, kernel: np.ndarray, salida: np.ndarray,
+                        workspace: Workspace) -> np.ndarray:
+    # filter2D calcula una correlación (igual que la referencia) y BORDER_REFLECT_101
+    # equivale al modo 'reflect' de np.pad
+    kernel = np.asarray(kernel, dtype=np.float32)
+    if img_array.shape[2] == 1:
+        cv2.filter2D(img_array[:, :, 0], cv2.CV_32F, kernel, dst=salida[:, :, 0],
+                     borderType=cv2.BORDER_REFLECT_101)
+    else:
+        cv2.filter2D(img_array, cv2.CV_32F, kernel, dst=salida, borderType=cv2.BORDER_REFLECT_101)
+    return salida
+
+
+def _convolucion_entera_opencv(img_array: np.ndarray, kernel: np.ndarray, salida: np.ndarray,
+                               workspace: Workspace) -> np.ndarray:
+    # filter2D no tiene salida int32: en ese caso se usa la versión NumPy
+    if salida.dtype != np.int16:
+        return _convolucion_entera_numpy(img_array, kernel, salida, workspace)
+
+    kernel = np.asarray(kernel, dtype=np.float32)
+    if img_array.shape[2] == 1:
+        cv2.filter2D(img_array[:, :, 0], cv2.CV_16S, kernel, dst=salida[:, :, 0],
+                     borderType=cv2.BORDER_REFLECT_101)
+    else:
+        cv2.filter2D(img_array, cv2.CV_16S, kernel, dst=salida, borderType=cv2.BORDER_REFLECT_101)
+    return salida
+
+
+# --- Backend JIT (numba, opcional) ---
+
+def _correlacion_bucle(padded, kernel, salida):
+    k_h, k_w = kernel.shape
+    alto, ancho, canales = salida.shape
+    for c in range(canales):
+        for i in range(alto):
+            for j in range(ancho):
+                acumulado = 0.0
+                for u in range(k_h):
+                    for v in range(k_w):
+                        acumulado += padded[i + u, j + v, c] * kernel[u, v]
+                salida[i, j, c] = acumulado
+
+
+@functools.cache
+def _bucles_numba() -> dict:
+    """
+    Importa numba y compila los bucles la primera vez que se usa el backend.
+
+    Si numba está instalado pero no se puede importar (por ejemplo, por una
+    versión de NumPy incompatible), el backend se quita del registro y se
+    lanza un RuntimeError que lo explica.
+    """
+    global _backend_global
+
+    try:
+        import numba
+    except ImportError as error:
+        _BACKENDS.pop("numba", None)
+        if _backend_global == "numba":
+            _backend_global = BACKEND_REFERENCIA
+        raise RuntimeError(f"El backend 'numba' no está disponible: numba está instalado pero "
+                           f"no se pudo importar ({error}). Se quitó del registro.") from error
+
+    return {
+        "correlacion": numba.njit(cache=True)(_correlacion_bucle),
+        "supresion_no_maxima": numba.njit(cache=True)(_supresion_no_maxima_bucle),
+        "histeresis": numba.njit(cache=True)(_histeresis_bucle),
+    }
+
+
+def _convolucion_numba(img_array: np.ndarray, kernel: np.ndarray, salida: np.ndarray,
+                       workspace: Workspace) -> np.ndarray:
+    k_h, k_w = kernel.shape
+    padded = _rellenar_reflejo(img_array, k_h // 2, k_w // 2, workspace)
+    _bucles_numba()["correlacion"](padded, np.asarray(kernel, dtype=np.float64), salida)
+    return salida
+
+
+def _supresion_no_maxima_numba(magnitud: np.ndarray, ang: np.ndarray, Z: np.ndarray,
+                               workspace: Workspace) -> np.ndarray:
+    Z.fill(0)
+    return _bucles_numba()["supresion_no_maxima"](magnitud, ang, Z)
+
+
+def _histeresis_numba(res: np.ndarray, workspace: Workspace) -> np.ndarray:
+    return _bucles_numba()["histeresis"](res, FUERTE, DEBIL)
+
+
+registrar_backend(BACKEND_REFERENCIA, {
+    "convolucion": _convolucion_referencia,
+    "supresion_no_maxima": _supresion_no_maxima_referencia,
+    "histeresis": _histeresis_referencia,
+})
+
+registrar_backend("numpy", {
+    "convolucion": _convolucion_numpy,
+    "supresion_no_maxima": _supresion_no_maxima_numpy,
+    "histeresis": _histeresis_numpy,
+    "convolucion_entera": _convolucion_entera_numpy,
+})
+
+# OpenCV solo acelera la convolución; cv2.Canny usa otro criterio de supresión
+# y de histéresis, así que esas etapas se reutilizan del backend NumPy.
+registrar_backend("opencv", {
+    "convolucion": _convolucion_opencv,
+    "supresion_no_maxima": _supresion_no_maxima_numpy,
+    "histeresis": _histeresis_numpy,
+    "convolucion_entera": _convolucion_entera_opencv,
+})
+
+if _NUMBA_INSTALADO:
+    registrar_backend("numba", {
+        "convolucion": _convolucion_numba,
+        "supresion_no_maxima": _supresion_no_maxima_numba,
+        "histeresis": _histeresis_numba,
+    })
+
+
+def _como_array(imagen: Image.Image | np.ndarray) -> np.ndarray:
+    """
+    PIL.Image -> np.ndarray; los arrays se devuelven sin copiar.
+    """
+    return imagen if isinstance(imagen, np.ndarray) else np.asarray(imagen)
+
+
+# Pesos ITU-R 601 en punto fijo (16 bits) con los que PIL hace convert("L")
+_PESOS_GRIS = (np.uint32(19595), np.uint32(38470), np.uint32(7471))
+
+
+def _a_gris(imagen: Image.Image | np.ndarray, workspace: Workspace) -> np.ndarray:
+    """
+    Escala de grises uint8. Las imágenes PIL usan convert("L"); los arrays RGB/RGBA
+    uint8 se convierten con la misma fórmula entera de PIL dentro de buffers del
+    workspace, así que un cuadro da el mismo resultado como array o como PIL.
+    """
+    if not isinstance(imagen, np.ndarray):
+        return np.asarray(imagen.convert("L"))
+
+    if imagen.ndim == 3 and imagen.shape[2] == 1:
+        imagen = imagen[:, :, 0]
+    if imagen.ndim == 2:
+        return imagen
+    if imagen.ndim != 3 or imagen.shape[2] not in (3, 4):
+        raise ValueError(f"Se esperaba una imagen en gris, RGB o RGBA; se recibió forma {imagen.shape}")
+
+    if imagen.dtype != np.uint8:
+        # cv2.cvtColor solo admite uint8, uint16 y float32
+        if imagen.dtype not in (np.uint16, np.float32):
+            convertida = workspace.get("filters.gris_entrada", imagen.shape, np.float32)
+            np.copyto(convertida, imagen, casting="unsafe")
+            imagen = convertida
+        gris = workspace.get("filters.gris", imagen.shape[:2], imagen.dtype)
+        codigo = cv2.COLOR_RGBA2GRAY if imagen.shape[2] == 4 else cv2.COLOR_RGB2GRAY
+        cv2.cvtColor(imagen, codigo, dst=gris)
+        return gris
+
+    gris = workspace.get("filters.gris", imagen.shape[:2], imagen.dtype)
+
+    # L = (R * 19595 + G * 38470 + B * 7471 + 0x8000) >> 16, como en PIL
+    acumulado = workspace.get("filters.gris_acumulado", imagen.shape[:2], np.uint32)
+    producto = workspace.get("filters.gris_producto", imagen.shape[:2], np.uint32)
+    np.multiply(imagen[:, :, 0], _PESOS_GRIS[0], out=acumulado)
+    for c in (1, 2):
+        np.multiply(imagen[:, :, c], _PESOS_GRIS[c], out=producto)
+        np.add(acumulado, producto, out=acumulado)
+    np.add(acumulado, np.uint32(0x8000), out=acumulado)
+    np.right_shift(acumulado, 16, out=acumulado)
+    np.copyto(gris, acumulado, casting="unsafe")
+    return gris
+
+
+def convolucion(imagen: Image.Image | np.ndarray, kernel: np.ndarray, backend: str | None = None,
+                out: np.ndarray | None = None, workspace: Workspace | None = None) -> np.ndarray:
     """
     Aplica una convolución genérica a una imagen usando un kernel dado.
 
     Parámetros
     ----------
-    imagen : PIL.Image
+    imagen : PIL.Image o np.ndarray
         Imagen de entrada (RGB o escala de grises).
     kernel : np.ndarray
         Matriz del kernel de convolución (debe ser 2D).
+    backend : str, opcional
+        Backend a usar en esta llamada. Si es None se usa el global (ver usar_backend).
+    out : np.ndarray, opcional
+        Array uint8 donde escribir el resultado (misma forma que la salida).
+    workspace : Workspace, opcional
+        Buffers temporales reutilizables. Con un array de entrada, out y un
+        workspace, las llamadas sucesivas no reservan memoria nueva.
 
     Retorna
     -------
     np.ndarray
         Imagen resultante después de aplicar la convolución.
     """
+    workspace = Workspace() if workspace is None else workspace
+
     # Convertir imagen a NumPy
-    img_array = np.array(imagen, dtype=np.float32)
+    img_array = _como_array(imagen)
+
+    return _convolucion_array(img_array, kernel, _resolver_backend(backend), out, workspace)
+
+
+def _acumulador_entero(img_array: np.ndarray, kernel: np.ndarray):
+    """
+    Tipo entero con el que la convolución de img_array con kernel es exacta, o None.
+
+    Solo aplica a imágenes uint8 y kernels con coeficientes enteros. Como los
+    píxeles están en [0, 255], toda suma parcial queda en
+    [-255 * suma(negativos), 255 * suma(positivos)]: si ese rango cabe en int16
+    se usa int16, si no int32, y si tampoco cabe se devuelve None (camino float).
+    """
+    if img_array.dtype != np.uint8:
+        return None
+
+    kernel = np.asarray(kernel)
+    if not np.all(np.isfinite(kernel)) or not np.array_equal(kernel, np.round(kernel)):
+        return None
+
+    positivos = int(kernel[kernel > 0].sum())
+    negativos = int(-kernel[kernel < 0].sum())
+
+    for tipo in (np.int16, np.int32):
+        limites = np.iinfo(tipo)
+        if 255 * positivos <= limites.max and -255 * negativos >= limites.min:
+            return tipo
+    return None
 
+
+def _convolucion_array(img_array: np.ndarray, kernel: np.ndarray, operaciones: dict,
+                       out: np.ndarray | None, workspace: Workspace) -> np.ndarray:
+    """
+    Convolución sobre un array ya convertido, con salida uint8 como convolucion().
+
+    Las imágenes uint8 con kernels enteros usan el camino entero del backend si
+    lo tiene (ver _acumulador_entero); el resto se convierte a float32.
+    """
     # Si es en escala de grises -> agregar dimensión
-    if img_array.ndim == 2:
+    gris = img_array.ndim == 2
+    if gris:
         img_array = img_array[:, :, np.newaxis]
 
-    # Tamaño del kernel
-    k_h, k_w = kernel.shape
-    pad_h, pad_w = k_h // 2, k_w // 2
+    acumulador = None
+    if "convolucion_entera" in operaciones:
+        acumulador = _acumulador_entero(img_array, kernel)
 
-    # Padding
-    padded = np.pad(img_array, ((pad_h, pad_h), (pad_w, pad_w), (0, 0)), mode='reflect')
+    if acumulador is not None:
+        salida = workspace.get("filters.salida_entera", img_array.shape, acumulador)
+        operaciones["convolucion_entera"](img_array, kernel, salida, workspace)
+    else:
+        if img_array.dtype != np.float32:
+            entrada = workspace.get("filters.entrada", img_array.shape, np.float32)
+            np.copyto(entrada, img_array)
+            img_array = entrada
 
-    # Crear salida
-    salida = np.zeros_like(img_array)
-
-    # Convolución canal por canal
-    for c in range(img_array.shape[2]):
-        for i in range(img_array.shape[0]):
-            for j in range(img_array.shape[1]):
-                region = padded[i:i + k_h, j:j + k_w, c]
-                salida[i, j, c] = np.sum(region * kernel)
+        salida = workspace.get("filters.salida", img_array.shape, np.float32)
+        operaciones["convolucion"](img_array, kernel, salida, workspace)
 
     # Normalizar al rango válido [0,255]
-    salida = np.clip(salida, 0, 255).astype(np.uint8)
+    np.clip(salida, 0, 255, out=salida)
 
     # Quitar canal si era gris
-    if salida.shape[2] == 1:
-        salida = salida[:, :, 0]
+    out = preparar_salida(out, img_array.shape[:2] if gris else img_array.shape, np.uint8)
+    np.copyto(out[:, :, np.newaxis] if gris else out, salida, casting='unsafe')
 
-    return salida
+    return out
 
 # --- Definir kernels de Sobel ---
 KERNEL_SOBEL_X = np.array([[-1, 0, 1],
@@ -60,143 +634,619 @@ KERNEL_SOBEL_Y = np.array([[-1, -2, -1],
                            [ 1,  2,  1]], dtype=np.float32)
 
 
-def sobel_x(imagen: Image.Image) -> np.ndarray:
+# Kernel Laplaciano clásico (detección de bordes sin dirección)
+KERNEL_LAPLACIANO = np.array([
+    [0, -1, 0],
+    [-1, 4, -1],
+    [0, -1, 0]
+], dtype=np.float32)
+
+# También se puede usar esta versión (más sensible):
+# KERNEL_LAPLACIANO = np.array([[-1,-1,-1], [-1,8,-1], [-1,-1,-1]], dtype=np.float32)
+
+
+def sobel_x(imagen: Image.Image | np.ndarray, backend: str | None = None,
+            out: np.ndarray | None = None, workspace: Workspace | None = None) -> np.ndarray:
     """
     Aplica el filtro Sobel en la dirección X.
     """
-    return convolucion(imagen.convert("L"), KERNEL_SOBEL_X)
+    workspace = Workspace() if workspace is None else workspace
+    return convolucion(_a_gris(imagen, workspace), KERNEL_SOBEL_X, backend, out, workspace)
 
 
-def sobel_y(imagen: Image.Image) -> np.ndarray:
+def sobel_y(imagen: Image.Image | np.ndarray, backend: str | None = None,
+            out: np.ndarray | None = None, workspace: Workspace | None = None) -> np.ndarray:
     """
     Aplica el filtro Sobel en la dirección Y.
     """
-    return convolucion(imagen.convert("L"), KERNEL_SOBEL_Y)
+    workspace = Workspace() if workspace is None else workspace
+    return convolucion(_a_gris(imagen, workspace), KERNEL_SOBEL_Y, backend, out, workspace)
 
-def canny(imagen: Image.Image, umbral_bajo: int = 50, umbral_alto: int = 150) -> np.ndarray:
+def canny(imagen: Image.Image | np.ndarray, umbral_bajo: int = 50, umbral_alto: int = 150,
+          backend: str | None = None, out: np.ndarray | None = None,
+          workspace: Workspace | None = None) -> np.ndarray:
     """
     Aplica el detector de bordes de Canny a una imagen en escala de grises.
 
     Parámetros:
     -----------
-    imagen : PIL.Image
+    imagen : PIL.Image o np.ndarray
         Imagen de entrada (RGB o escala de grises).
     umbral_bajo : int
         Umbral bajo para histéresis.
     umbral_alto : int
         Umbral alto para histéresis.
+    backend : str, opcional
+        Backend a usar en esta llamada. Si es None se usa el global (ver usar_backend).
+    out : np.ndarray, opcional
+        Array uint8 (alto, ancho) donde escribir el resultado.
+    workspace : Workspace, opcional
+        Buffers temporales reutilizables entre llamadas.
 
     Retorna:
     --------
     np.ndarray
         Imagen binaria con los bordes detectados.
     """
+    workspace = Workspace() if workspace is None else workspace
+
     # 1. Convertir a escala de grises
-    gris = imagen.convert("L")
-    img = np.array(gris, dtype=np.float32)
+    gris = _a_gris(imagen, workspace)
 
-    # 2. Suavizado con filtro Gaussiano
-    img = np.array(gris.filter(ImageFilter.GaussianBlur(radius=1.4)), dtype=np.float32)
+    return _canny_array(gris, umbral_bajo, umbral_alto, _resolver_backend(backend), out, workspace)
+
+
+def _canny_array(gris: np.ndarray, umbral_bajo: float, umbral_alto: float, operaciones: dict,
+                 out: np.ndarray | None, workspace: Workspace) -> np.ndarray:
+    """
+    Etapas 3-5 de Canny sobre un array 2D en escala de grises (uint8 o float32).
+    """
+    gradiente_x, gradiente_y = _gradientes_sobel(gris, operaciones, workspace)
+    return _canny_gradientes(gradiente_x, gradiente_y, umbral_bajo, umbral_alto, operaciones, out, workspace)
+
+
+def _gradientes_sobel(gris: np.ndarray, operaciones: dict, workspace: Workspace) -> tuple:
+    """
+    Etapa 3 de Canny: gradientes Sobel recortados a uint8 (como los de convolucion()).
+    """
+    M, N = gris.shape
 
     # 3. Gradientes Sobel
     Kx = np.array([[-1,0,1],[-2,0,2],[-1,0,1]], dtype=np.float32)
     Ky = np.array([[-1,-2,-1],[0,0,0],[1,2,1]], dtype=np.float32)
 
-    Gx = convolucion(gris, Kx).astype(np.float32)
-    Gy = convolucion(gris, Ky).astype(np.float32)
+    gradiente_x = _convolucion_array(gris, Kx, operaciones,
+                                     workspace.get("filters.canny_gradiente_x", (M, N), np.uint8), workspace)
+    gradiente_y = _convolucion_array(gris, Ky, operaciones,
+                                     workspace.get("filters.canny_gradiente_y", (M, N), np.uint8), workspace)
 
-    magnitud = np.hypot(Gx, Gy)
-    magnitud = magnitud / magnitud.max() * 255
-    angulo = np.arctan2(Gy, Gx)
+    return gradiente_x, gradiente_y
 
-    # 4. Supresión no máxima
-    M, N = magnitud.shape
-    Z = np.zeros((M, N), dtype=np.float32)
-    ang = angulo * 180. / np.pi
-    ang[ang < 0] += 180
 
-    for i in range(1, M-1):
-        for j in range(1, N-1):
-            q = 255
-            r = 255
+def _canny_gradientes(gradiente_x: np.ndarray, gradiente_y: np.ndarray, umbral_bajo: float,
+                      umbral_alto: float, operaciones: dict, out: np.ndarray | None,
+                      workspace: Workspace) -> np.ndarray:
+    """
+    Etapas 4-5 de Canny a partir de los gradientes Sobel uint8 (salida de convolucion()).
+    """
+    magnitud, ang = _magnitud_angulo(gradiente_x, gradiente_y, workspace)
+    Z = _supresion_no_maxima(magnitud, ang, operaciones, workspace)
+    return _umbral_histeresis(Z, umbral_bajo, umbral_alto, operaciones, out, workspace)
 
-            # Dirección 0
-            if (0 <= ang[i,j] < 22.5) or (157.5 <= ang[i,j] <= 180):
-                q = magnitud[i, j+1]
-                r = magnitud[i, j-1]
-            # Dirección 45
-            elif (22.5 <= ang[i,j] < 67.5):
-                q = magnitud[i+1, j-1]
-                r = magnitud[i-1, j+1]
-            # Dirección 90
-            elif (67.5 <= ang[i,j] < 112.5):
-                q = magnitud[i+1, j]
-                r = magnitud[i-1, j]
-            # Dirección 135
-            elif (112.5 <= ang[i,j] < 157.5):
-                q = magnitud[i-1, j-1]
-                r = magnitud[i+1, j+1]
 
-            if (magnitud[i,j] >= q) and (magnitud[i,j] >= r):
-                Z[i,j] = magnitud[i,j]
-            else:
-                Z[i,j] = 0
+def _supresion_no_maxima(magnitud: np.ndarray, ang: np.ndarray, operaciones: dict,
+                         workspace: Workspace) -> np.ndarray:
+    """
+    Etapa 4 de Canny: supresión no máxima de la magnitud normalizada.
+    """
+    Z = workspace.get("filters.canny_Z", magnitud.shape, np.float32)
+    operaciones["supresion_no_maxima"](magnitud, ang, Z, workspace)
+    return Z
+
+
+def _magnitud_angulo(gradiente_x: np.ndarray, gradiente_y: np.ndarray, workspace: Workspace) -> tuple:
+    """
+    Magnitud normalizada a [0, 255] y ángulo en grados [0, 180] del gradiente.
+    """
+    M, N = gradiente_x.shape
+
+    Gx = workspace.get("filters.canny_gx", (M, N), np.float32)
+    Gy = workspace.get("filters.canny_gy", (M, N), np.float32)
+    np.copyto(Gx, gradiente_x)
+    np.copyto(Gy, gradiente_y)
+
+    magnitud = workspace.get("filters.canny_magnitud", (M, N), np.float32)
+    np.hypot(Gx, Gy, out=magnitud)
+    # Sin gradiente (imagen plana) la magnitud queda en 0 en lugar de 0/0 = NaN
+    maximo = magnitud.max()
+    if maximo > 0:
+        np.divide(magnitud, maximo, out=magnitud)
+        np.multiply(magnitud, 255, out=magnitud)
+
+    ang = workspace.get("filters.canny_angulo", (M, N), np.float32)
+    mascara = workspace.get("filters.canny_mascara", (M, N), bool)
+    np.arctan2(Gy, Gx, out=ang)
+    np.multiply(ang, 180., out=ang)
+    np.divide(ang, np.pi, out=ang)
+    np.less(ang, 0, out=mascara)
+    np.add(ang, 180, out=ang, where=mascara)
+
+    return magnitud, ang
+
+
+def _umbral_histeresis(Z: np.ndarray, umbral_bajo: float, umbral_alto: float, operaciones: dict,
+                       out: np.ndarray | None, workspace: Workspace) -> np.ndarray:
+    """
+    Etapa 5 de Canny: umbral doble sobre las magnitudes suprimidas y conexión por histéresis.
+    """
+    M, N = Z.shape
 
-    # 5. Umbral con histéresis
-    fuerte = 255
-    debil = 50
+    res = preparar_salida(out, (M, N), np.uint8)
+    res.fill(0)
 
-    res = np.zeros((M,N), dtype=np.uint8)
-    fuerte_i, fuerte_j = np.where(Z >= umbral_alto)
-    debil_i, debil_j = np.where((Z <= umbral_alto) & (Z >= umbral_bajo))
+    mascara = workspace.get("filters.canny_mascara", (M, N), bool)
+    np.greater_equal(Z, umbral_alto, out=mascara)
+    np.copyto(res, FUERTE, where=mascara)
 
-    res[fuerte_i, fuerte_j] = fuerte
-    res[debil_i, debil_j] = debil
+    auxiliar = workspace.get("filters.canny_auxiliar", (M, N), bool)
+    np.less_equal(Z, umbral_alto, out=mascara)
+    np.greater_equal(Z, umbral_bajo, out=auxiliar)
+    np.logical_and(mascara, auxiliar, out=mascara)
+    np.copyto(res, DEBIL, where=mascara)
 
     # Conexión por histéresis
-    for i in range(1, M-1):
-        for j in range(1, N-1):
-            if res[i,j] == debil:
-                if ((res[i+1, j-1] == fuerte) or (res[i+1, j] == fuerte) or (res[i+1, j+1] == fuerte)
-                    or (res[i, j-1] == fuerte) or (res[i, j+1] == fuerte)
-                    or (res[i-1, j-1] == fuerte) or (res[i-1, j] == fuerte) or (res[i-1, j+1] == fuerte)):
-                    res[i,j] = fuerte
-                else:
-                    res[i,j] = 0
+    operaciones["histeresis"](res, workspace)
 
     return res
 
-def filtro_laplaciano(imagen: Image.Image) -> np.ndarray:
+
+# --- Etapas de Canny por separado ---
+# Permiten calcular las etapas locales (gradientes, supresión no máxima) por
+# regiones o en otros procesos, y las globales (normalización, histéresis)
+# sobre el cuadro completo, con el mismo resultado que canny().
+
+def gradientes_canny(imagen: Image.Image | np.ndarray, backend: str | None = None,
+                     out: np.ndarray | None = None, workspace: Workspace | None = None) -> np.ndarray:
+    """
+    Gradientes Sobel X e Y de la imagen en escala de grises, tal como los usa canny().
+
+    Retorna:
+    --------
+    np.ndarray
+        Array uint8 (alto, ancho, 2) con el gradiente X en el canal 0 y el Y en el 1,
+        recortados a [0, 255] como la salida de convolucion().
+    """
+    workspace = Workspace() if workspace is None else workspace
+    gris = _a_gris(imagen, workspace)
+
+    gradientes = preparar_salida(out, gris.shape + (2,), np.uint8)
+    gradiente_x, gradiente_y = _gradientes_sobel(gris, _resolver_backend(backend), workspace)
+    gradientes[:, :, 0] = gradiente_x
+    gradientes[:, :, 1] = gradiente_y
+    return gradientes
+
+
+def magnitud_angulo(gradientes: np.ndarray, workspace: Workspace | None = None) -> tuple:
+    """
+    Magnitud normalizada a [0, 255] (con el máximo global) y ángulo en grados [0, 180]
+    a partir de la salida de gradientes_canny().
+    """
+    workspace = Workspace() if workspace is None else workspace
+    return _magnitud_angulo(gradientes[:, :, 0], gradientes[:, :, 1], workspace)
+
+
+def supresion_no_maxima(magnitud: np.ndarray, ang: np.ndarray, backend: str | None = None,
+                        workspace: Workspace | None = None) -> np.ndarray:
+    """
+    Supresión no máxima de la magnitud (operación local de radio 1).
+
+    Retorna un buffer del workspace; cópielo si necesita conservarlo.
+    """
+    workspace = Workspace() if workspace is None else workspace
+    return _supresion_no_maxima(magnitud, ang, _resolver_backend(backend), workspace)
+
+
+def umbral_histeresis(Z: np.ndarray, umbral_bajo: float, umbral_alto: float,
+                      backend: str | None = None, out: np.ndarray | None = None,
+                      workspace: Workspace | None = None) -> np.ndarray:
+    """
+    Umbral doble y conexión por histéresis sobre las magnitudes suprimidas.
+    """
+    workspace = Workspace() if workspace is None else workspace
+    return _umbral_histeresis(Z, umbral_bajo, umbral_alto, _resolver_backend(backend), out, workspace)
+
+
+def canny_desde_gradientes(gradientes: np.ndarray, umbral_bajo: float = 50, umbral_alto: float = 150,
+                           backend: str | None = None, out: np.ndarray | None = None,
+                           workspace: Workspace | None = None) -> np.ndarray:
+    """
+    Completa canny() a partir de la salida de gradientes_canny().
+    """
+    workspace = Workspace() if workspace is None else workspace
+    return _canny_gradientes(gradientes[:, :, 0], gradientes[:, :, 1], umbral_bajo, umbral_alto,
+                             _resolver_backend(backend), out, workspace)
+
+
+def procesar_region(funcion, entradas: list, region: tuple, radio: tuple, destino: np.ndarray) -> None:
+    """
+    Aplica una operación local a una región y escribe el resultado en destino.
+
+    La operación se evalúa sobre las entradas recortadas a la región ampliada con
+    un halo de `radio` (sin salir de la imagen), de modo que los píxeles de la
+    región quedan igual que si se procesara la imagen completa.
+
+    Parámetros:
+    -----------
+    funcion : callable
+        Operación local: recibe un recorte de cada entrada y retorna un array
+        con el mismo alto y ancho.
+    entradas : list of np.ndarray
+        Imágenes completas de entrada (mismo alto y ancho que destino).
+    region : tuple
+        (fila_inicio, fila_fin, columna_inicio, columna_fin) a calcular.
+    radio : tuple
+        Radio (filas, columnas) de la operación.
+    destino : np.ndarray
+        Array de salida de la imagen completa.
+    """
+    alto, ancho = destino.shape[:2]
+    f0, f1, c0, c1 = region
+    radio_f, radio_c = radio
+
+    # Entrada necesaria: la región ampliada con el radio de la operación
+    e_f0, e_f1 = max(f0 - radio_f, 0), min(f1 + radio_f, alto)
+    e_c0, e_c1 = max(c0 - radio_c, 0), min(c1 + radio_c, ancho)
+
+    parcial = funcion(*(entrada[e_f0:e_f1, e_c0:e_c1] for entrada in entradas))
+    destino[f0:f1, c0:c1] = parcial[f0 - e_f0:f1 - e_f0, c0 - e_c0:c1 - e_c0]
+
+
+# --- Umbrales automáticos para Canny ---
+
+METODOS_UMBRAL = ("mediana", "otsu")
+
+
+def _histograma_magnitud(magnitud: np.ndarray) -> np.ndarray:
+    """
+    Histograma de 256 bins de la magnitud normalizada a [0, 255].
+
+    cv2.calcHist recorre el array float32 una sola vez, sin convertirlo a
+    uint8 ni reservar memoria del tamaño de la imagen.
+    """
+    return cv2.calcHist([magnitud], [0], None, [256], [0, 256]).ravel()
+
+
+def _validar_umbral_auto(metodo: str, sigma: float) -> None:
+    if metodo not in METODOS_UMBRAL:
+        raise ValueError(f"Método de umbral desconocido: '{metodo}'. Disponibles: {METODOS_UMBRAL}")
+    if not 0 <= sigma < 1:
+        raise ValueError(f"sigma debe cumplir 0 <= sigma < 1, se recibió {sigma}")
+
+
+def umbrales_automaticos(histograma: np.ndarray, metodo: str = "mediana",
+                         sigma: float = 0.33) -> tuple[float, float]:
+    """
+    Calcula los umbrales de histéresis de Canny a partir del histograma de la magnitud del gradiente.
+
+    El bin 0 (píxeles sin gradiente, zonas planas) se ignora; si domina el
+    histograma llevaría ambos métodos a umbrales casi nulos.
+
+    Parámetros:
+    -----------
+    histograma : np.ndarray
+        Histograma de 256 bins de la magnitud normalizada a [0, 255].
+    metodo : str
+        "mediana": umbrales (1 - sigma) * m y (1 + sigma) * m, con m la mediana
+        de la magnitud. "otsu": umbral alto igual al umbral de Otsu de la
+        magnitud y umbral bajo igual a la mitad.
+    sigma : float
+        Amplitud relativa del intervalo alrededor de la mediana (solo "mediana"),
+        con 0 <= sigma < 1 para que umbral_bajo <= umbral_alto.
+
+    Retorna:
+    --------
+    tuple[float, float]
+        (umbral_bajo, umbral_alto). Sin gradiente en la imagen se retorna
+        (255.0, 255.0), que no marca ningún borde.
+    """
+    _validar_umbral_auto(metodo, sigma)
+
+    conteos = np.asarray(histograma, dtype=np.float64).ravel()[1:256]
+    valores = np.arange(1, conteos.size + 1, dtype=np.float64)
+    total = conteos.sum()
+    if total == 0:
+        return 255.0, 255.0
+
+    if metodo == "mediana":
+        mediana = valores[np.searchsorted(np.cumsum(conteos), total / 2)]
+        return max(0.0, (1 - sigma) * mediana), min(255.0, (1 + sigma) * mediana)
+
+    # Otsu: umbral que maximiza la varianza entre clases
+    peso = np.cumsum(conteos)
+    media = np.cumsum(conteos * valores)
+    resto = total - peso
+    with np.errstate(divide="ignore", invalid="ignore"):
+        varianza = (media[-1] * peso - total * media) ** 2 / (peso * resto)
+    varianza = np.nan_to_num(varianza, nan=0.0, posinf=0.0)
+    alto = float(valores[np.argmax(varianza)])
+    return alto / 2, alto
+
+
+def canny_auto(imagen: Image.Image | np.ndarray, metodo: str = "mediana", sigma: float = 0.33,
+               backend: str | None = None, out: np.ndarray | None = None,
+               workspace: Workspace | None = None) -> tuple[np.ndarray, float, float]:
+    """
+    Detector de Canny con umbrales calculados a partir de la propia imagen.
+
+    El histograma de la magnitud se construye en la etapa de gradientes, sobre
+    la magnitud que Canny ya calcula, y los umbrales se derivan de él (ver
+    umbrales_automaticos): no se vuelve a recorrer la imagen ni a ejecutar
+    Canny. El resultado es idéntico a canny(imagen, umbral_bajo, umbral_alto)
+    con los umbrales retornados.
+
+    Parámetros:
+    -----------
+    imagen : PIL.Image o np.ndarray
+        Imagen de entrada (RGB o escala de grises).
+    metodo : str
+        "mediana" u "otsu".
+    sigma : float
+        Amplitud del intervalo alrededor de la mediana (solo "mediana").
+    backend, out, workspace :
+        Como en canny.
+
+    Retorna:
+    --------
+    tuple
+        (bordes, umbral_bajo, umbral_alto).
+    """
+    _validar_umbral_auto(metodo, sigma)
+
+    workspace = Workspace() if workspace is None else workspace
+    operaciones = _resolver_backend(backend)
+
+    gris = _a_gris(imagen, workspace)
+    gradiente_x, gradiente_y = _gradientes_sobel(gris, operaciones, workspace)
+    magnitud, ang = _magnitud_angulo(gradiente_x, gradiente_y, workspace)
+
+    umbral_bajo, umbral_alto = umbrales_automaticos(_histograma_magnitud(magnitud), metodo, sigma)
+
+    Z = _supresion_no_maxima(magnitud, ang, operaciones, workspace)
+    bordes = _umbral_histeresis(Z, umbral_bajo, umbral_alto, operaciones, out, workspace)
+
+    return bordes, umbral_bajo, umbral_alto
+
+
+def filtro_laplaciano(imagen: Image.Image | np.ndarray, backend: str | None = None,
+                      out: np.ndarray | None = None, workspace: Workspace | None = None) -> np.ndarray:
     """
     Aplica un filtro Laplaciano a la imagen para resaltar bordes.
-    
+
     Parámetros:
     -----------
-    imagen : PIL.Image
+    imagen : PIL.Image o np.ndarray
         Imagen de entrada (RGB o escala de grises).
-    
+    backend : str, opcional
+        Backend a usar en esta llamada. Si es None se usa el global (ver usar_backend).
+    out : np.ndarray, opcional
+        Array uint8 (alto, ancho) donde escribir el resultado.
+    workspace : Workspace, opcional
+        Buffers temporales reutilizables entre llamadas.
+
     Retorna:
     --------
     np.ndarray
         Imagen resultante después de aplicar el filtro Laplaciano.
     """
+    workspace = Workspace() if workspace is None else workspace
+
     # Convertir a escala de grises
-    gris = imagen.convert("L")
-    
-    # Kernel Laplaciano clásico (detección de bordes sin dirección)
-    kernel = np.array([
-        [0, -1, 0],
-        [-1, 4, -1],
-        [0, -1, 0]
-    ], dtype=np.float32)
+    gris = _a_gris(imagen, workspace)
+
+    # Aplicar convolución (el resultado ya queda recortado a [0,255])
+    return convolucion(gris, KERNEL_LAPLACIANO, backend, out, workspace)
+
+
+
+def verificar_backend(nombre: str, repeticiones: int = 3, tamano: tuple = (24, 32),
+                      tolerancia: int = 1, semilla: int = 0) -> dict:
+    """
+    Compara un backend contra el de referencia sobre imágenes aleatorias.
+
+    Parámetros:
+    -----------
+    nombre : str
+        Backend a verificar.
+    repeticiones : int
+        Número de imágenes (y kernels) aleatorios a probar.
+    tamano : tuple
+        Tamaño (alto, ancho) de las imágenes de prueba.
+    tolerancia : int
+        Diferencia absoluta máxima admitida por píxel. La convolución con kernels
+        reales puede diferir en 1 por el orden de las sumas en punto flotante.
+    semilla : int
+        Semilla del generador aleatorio.
+
+    Retorna:
+    --------
+    dict
+        {operación: bool} indicando si el backend es equivalente en cada operación.
+    """
+    _resolver_backend(nombre)
+    rng = np.random.default_rng(semilla)
+    alto, ancho = tamano
+
+    resultados = {op: True for op in ("convolucion", "sobel_x", "sobel_y", "filtro_laplaciano", "canny")}
 
-    # También se puede usar esta versión (más sensible):
-    # kernel = np.array([[-1,-1,-1], [-1,8,-1], [-1,-1,-1]], dtype=np.float32)
+    for _ in range(repeticiones):
+        rgb = Image.fromarray(rng.integers(0, 256, (alto, ancho, 3), dtype=np.uint8), "RGB")
+        lado = int(rng.choice([3, 5]))
+        kernel = rng.normal(size=(lado, lado)).astype(np.float32)
+        # Kernels enteros: acumulación en int16 y, con coeficientes grandes, en int32
+        kernel_entero = rng.integers(-4, 5, size=(lado, lado)).astype(np.float32)
+        kernel_grande = rng.integers(-300, 301, size=(lado, lado)).astype(np.float32)
 
-    # Aplicar convolución
-    lap = convolucion(gris, kernel)
+        casos = {
+            "convolucion": [lambda b: convolucion(rgb, kernel, b),
+                            lambda b: convolucion(rgb.convert("L"), kernel, b),
+                            lambda b: convolucion(rgb, kernel_entero, b),
+                            lambda b: convolucion(rgb.convert("L"), kernel_grande, b)],
+            "sobel_x": [lambda b: sobel_x(rgb, b)],
+            "sobel_y": [lambda b: sobel_y(rgb, b)],
+            "filtro_laplaciano": [lambda b: filtro_laplaciano(rgb, b)],
+            "canny": [lambda b: canny(rgb, 50, 150, b)],
+        }
 
-    # Normalizar resultado a rango [0,255]
-    lap = np.clip(lap, 0, 255).astype(np.uint8)
+        for op, funciones in casos.items():
+            for funcion in funciones:
+                esperado = funcion(BACKEND_REFERENCIA).astype(np.int16)
+                obtenido = funcion(nombre).astype(np.int16)
+                if esperado.shape != obtenido.shape or np.abs(esperado - obtenido).max() > tolerancia:
+                    resultados[op] = False
 
-    return lap
\ No newline at end of file
+    return resultados
+
+
+# --- Pirámide de escalas ---
+
+# Kernel binomial 1D (aproximación gaussiana, sigma ~ 1) usado para construir la pirámide
+KERNEL_BINOMIAL = np.array([1, 4, 6, 4, 1], dtype=np.float32) / 16
+
+
+def _respuesta_cruda(img_array: np.ndarray, kernel: np.ndarray, operaciones: dict,
+                     workspace: Workspace) -> np.ndarray:
+    """
+    Respuesta float32 sin recortar de un kernel, en un array nuevo.
+    """
+    salida = np.empty(img_array.shape, dtype=np.float32)
+    return operaciones["convolucion"](img_array, kernel, salida, workspace)
+
+
+def construir_piramide(imagen: Image.Image | np.ndarray, niveles: int = 4, backend: str | None = None) -> dict:
+    """
+    Construye una pirámide gaussiana de la imagen en escala de grises.
+
+    Cada nivel se suaviza una sola vez con un kernel binomial separable y se
+    diezma por 2 para obtener el siguiente, así que el costo total es ~4/3 del
+    de procesar solo el nivel 0. Las respuestas multiescala (piramide_laplaciana,
+    respuestas_log, bordes_piramide) reutilizan estos niveles sin recalcularlos.
+
+    Parámetros:
+    -----------
+    imagen : PIL.Image o np.ndarray
+        Imagen de entrada (RGB o escala de grises).
+    niveles : int
+        Número máximo de niveles. Se construyen menos si la imagen se vuelve
+        demasiado pequeña para el kernel de suavizado.
+    backend : str, opcional
+        Backend usado para las convoluciones (ver usar_backend).
+
+    Retorna:
+    --------
+    dict
+        {"gaussiana": [niveles float32], "suavizada": [niveles suavizados float32]}.
+        El nivel k tiene 1/2^k de la resolución original.
+    """
+    if niveles < 1:
+        raise ValueError("La pirámide debe tener al menos un nivel")
+
+    operaciones = _resolver_backend(backend)
+    workspace = Workspace()
+    fila = KERNEL_BINOMIAL[np.newaxis, :]
+    columna = KERNEL_BINOMIAL[:, np.newaxis]
+    minimo = len(KERNEL_BINOMIAL)
+
+    nivel = np.array(_a_gris(imagen, workspace), dtype=np.float32)  # copia: el buffer gris es del workspace
+    gaussiana, suavizada = [], []
+
+    for k in range(niveles):
+        # Suavizado separable: dos pasadas 1D en lugar de una 5x5
+        suave = _respuesta_cruda(nivel[:, :, np.newaxis], fila, operaciones, workspace)
+        suave = _respuesta_cruda(suave, columna, operaciones, workspace)[:, :, 0]
+
+        gaussiana.append(nivel)
+        suavizada.append(suave)
+
+        # Diezmado: el siguiente nivel parte del suavizado ya calculado
+        siguiente = suave[::2, ::2]
+        if k + 1 == niveles or min(siguiente.shape) < minimo:
+            break
+        nivel = np.ascontiguousarray(siguiente)
+
+    return {"gaussiana": gaussiana, "suavizada": suavizada}
+
+
+def piramide_laplaciana(piramide: dict) -> list:
+    """
+    Respuestas DoG (diferencia de gaussianas) con signo de cada nivel.
+
+    Se calculan como nivel - nivel suavizado, reutilizando el suavizado que ya
+    se hizo al construir la pirámide (no requiere convoluciones adicionales).
+
+    Parámetros:
+    -----------
+    piramide : dict
+        Pirámide devuelta por construir_piramide.
+
+    Retorna:
+    --------
+    list of np.ndarray
+        Respuestas float32 con signo, una por nivel.
+    """
+    return [g - s for g, s in zip(piramide["gaussiana"], piramide["suavizada"])]
+
+
+def respuestas_log(piramide: dict, backend: str | None = None) -> list:
+    """
+    Respuestas LoG (laplaciano del gaussiano) con signo de cada nivel.
+
+    A diferencia de filtro_laplaciano, no se recortan los valores negativos, por
+    lo que los cruces por cero siguen disponibles. Como cada nivel tiene la mitad
+    de resolución que el anterior, las respuestas ya están normalizadas en escala.
+
+    Parámetros:
+    -----------
+    piramide : dict
+        Pirámide devuelta por construir_piramide.
+    backend : str, opcional
+        Backend usado para las convoluciones (ver usar_backend).
+
+    Retorna:
+    --------
+    list of np.ndarray
+        Respuestas float32 con signo, una por nivel.
+    """
+    operaciones = _resolver_backend(backend)
+    workspace = Workspace()
+    return [_respuesta_cruda(s[:, :, np.newaxis], KERNEL_LAPLACIANO, operaciones, workspace)[:, :, 0]
+            for s in piramide["suavizada"]]
+
+
+def bordes_piramide(piramide: dict, umbral_bajo: int = 50, umbral_alto: int = 150,
+                    backend: str | None = None) -> list:
+    """
+    Aplica Canny a cada nivel de la pirámide.
+
+    El nivel 0 coincide con canny() sobre la imagen original; los demás niveles
+    se toman de la pirámide en lugar de redimensionar y volver a procesar la imagen.
+
+    Parámetros:
+    -----------
+    piramide : dict
+        Pirámide devuelta por construir_piramide.
+    umbral_bajo : int
+        Umbral bajo para histéresis.
+    umbral_alto : int
+        Umbral alto para histéresis.
+    backend : str, opcional
+        Backend a usar (ver usar_backend).
+
+    Retorna:
+    --------
+    list of np.ndarray
+        Mapas de bordes binarios, uno por nivel.
+    """
+    operaciones = _resolver_backend(backend)
+    workspace = Workspace()
+    return [_canny_array(g, umbral_bajo, umbral_alto, operaciones, None, workspace)
+            for g in piramide["gaussiana"]]
@@ -0,0 +1,219 @@
+import numpy as np
+import cv2
+
+from cvtools import filters
+from cvtools.workspace import Workspace
+
+
+class ProcesadorIncremental:
+    """
+    Aplica una operación local a cuadros de video recalculando solo lo que cambia.
+
+    Guarda el cuadro anterior y su resultado. En cada cuadro nuevo compara ambos
+    por bloques de tamano_bloque x tamano_bloque y solo vuelve a aplicar la
+    operación sobre los bloques que cambiaron, ampliados con un halo del radio
+    del kernel (los píxeles de salida a los que puede llegar el cambio). El resto
+    del resultado se reutiliza. Con tolerancia=0 el resultado es idéntico al de
+    procesar el cuadro completo.
+
+    Parámetros:
+    -----------
+    funcion : callable
+        Operación local: recibe un array (alto, ancho, ...) y retorna otro con el
+        mismo alto y ancho. Cada píxel de salida debe depender solo de la entrada
+        a una distancia de a lo sumo `radio`.
+    radio : tuple
+        Radio (filas, columnas) de la operación, normalmente (k_h // 2, k_w // 2).
+    tamano_bloque : int
+        Lado de los bloques de comparación, en píxeles.
+    tolerancia : int
+        Diferencia máxima por píxel que se ignora al comparar bloques (ruido del
+        sensor). Con valores > 0 el resultado deja de ser exacto.
+    umbral_completo : float
+        Si cambia una fracción de bloques mayor que esta, se procesa el cuadro
+        completo (más barato que muchos bloques con halo).
+    """
+
+    def __init__(self, funcion, radio: tuple, tamano_bloque: int = 32, tolerancia: int = 0,
+                 umbral_completo: float = 0.5):
+        if tamano_bloque < 1:
+            raise ValueError("El tamaño de bloque debe ser positivo")
+
+        self.funcion = funcion
+        self.radio = tuple(radio)
+        self.tamano_bloque = tamano_bloque
+        self.tolerancia = tolerancia
+        self.umbral_completo = umbral_completo
+
+        self.fraccion_recalculada = 1.0
+        self._workspace = Workspace()
+        self.reiniciar()
+
+    def reiniciar(self) -> None:
+        """
+        Olvida el cuadro anterior: el siguiente cuadro se procesa completo.
+        """
+        self._anterior = None
+        self._salida = None
+        self._workspace.clear()
+
+    def procesar(self, cuadro: np.ndarray) -> np.ndarray:
+        """
+        Procesa un cuadro reutilizando el resultado del anterior donde no cambió.
+
+        Retorna el array de resultado interno, que se actualiza en el siguiente
+        cuadro; cópielo si necesita conservarlo. La fracción del área recalculada
+        queda en self.fraccion_recalculada.
+        """
+        cuadro = np.asarray(cuadro)
+
+        if (self._anterior is None or self._anterior.shape != cuadro.shape
+                or self._anterior.dtype != cuadro.dtype):
+            self._workspace.clear()
+            self._salida = np.array(self.funcion(cuadro))
+            self._anterior = cuadro.copy()
+            self.fraccion_recalculada = 1.0
+            return self._salida
+
+        cambiados = self._bloques_cambiados(cuadro)
+        cantidad = np.count_nonzero(cambiados)
+
+        if cantidad == 0:
+            self.fraccion_recalculada = 0.0
+        elif cantidad > self.umbral_completo * cambiados.size:
+            np.copyto(self._salida, self.funcion(cuadro))
+            self.fraccion_recalculada = 1.0
+        else:
+            area = self._recalcular_bloques(cuadro, cambiados)
+            self.fraccion_recalculada = min(1.0, area / (cuadro.shape[0] * cuadro.shape[1]))
+
+        np.copyto(self._anterior, cuadro)
+        return self._salida
+
+    def _bloques_cambiados(self, cuadro: np.ndarray) -> np.ndarray:
+        """
+        Máscara (bloques_filas, bloques_columnas) de los bloques que cambiaron.
+        """
+        diferencia = self._workspace.get("incremental.diferencia", cuadro.shape, cuadro.dtype)
+        cv2.absdiff(cuadro, self._anterior, dst=diferencia)
+
+        if diferencia.ndim == 3:
+            por_pixel = self._workspace.get("incremental.por_pixel", cuadro.shape[:2], cuadro.dtype)
+            np.max(diferencia, axis=2, out=por_pixel)
+            diferencia = por_pixel
+
+        alto, ancho = diferencia.shape
+        filas = np.maximum.reduceat(diferencia, np.arange(0, alto, self.tamano_bloque), axis=0)
+        bloques = np.maximum.reduceat(filas, np.arange(0, ancho, self.tamano_bloque), axis=1)
+
+        return bloques > self.tolerancia
+
+    def _recalcular_bloques(self, cuadro: np.ndarray, cambiados: np.ndarray) -> int:
+        """
+        Recalcula los bloques cambiados con su halo y retorna el área recalculada.
+        """
+        alto, ancho = cuadro.shape[:2]
+        radio_f, radio_c = self.radio
+        bloque = self.tamano_bloque
+        area = 0
+
+        # Los bloques cambiados contiguos de una misma fila de bloques se agrupan
+        # en un solo rectángulo, para no repetir el halo entre ellos.
+        for i, fila in enumerate(cambiados):
+            columnas = np.flatnonzero(fila)
+            if columnas.size == 0:
+                continue
+            cortes = np.flatnonzero(np.diff(columnas) > 1) + 1
+
+            for tramo in np.split(columnas, cortes):
+                # Región de salida afectada: bloques + halo del radio (la entrada
+                # necesaria para calcularla, con otro halo, la recorta procesar_region)
+                f0 = max(i * bloque - radio_f, 0)
+                f1 = min((i + 1) * bloque + radio_f, alto)
+                c0 = max(tramo[0] * bloque - radio_c, 0)
+                c1 = min((tramo[-1] + 1) * bloque + radio_c, ancho)
+
+                filters.procesar_region(self.funcion, [cuadro], (f0, f1, c0, c1), self.radio, self._salida)
+                area += (f1 - f0) * (c1 - c0)
+
+        return area
+
+
+def convolucion_incremental(kernel: np.ndarray, backend: str | None = None, tamano_bloque: int = 32,
+                            tolerancia: int = 0, umbral_completo: float = 0.5) -> ProcesadorIncremental:
+    """
+    Crea un ProcesadorIncremental que aplica filters.convolucion con el kernel dado.
+
+    Ejemplo:
+    --------
+    >>> incremental = convolucion_incremental(filters.KERNEL_SOBEL_X)
+    >>> for cuadro in video:
+    ...     salida = incremental.procesar(cuadro)
+    ...     print(incremental.fraccion_recalculada)
+    """
+    k_h, k_w = np.asarray(kernel).shape
+
+    def aplicar(region: np.ndarray) -> np.ndarray:
+        # Sin workspace persistente: cada región cambiada tiene otra forma y sus
+        # buffers se acumularían sin límite en un video largo.
+        return filters.convolucion(region, kernel, backend)
+
+    return ProcesadorIncremental(aplicar, (k_h // 2, k_w // 2), tamano_bloque, tolerancia, umbral_completo)
+
+
+class CannyIncremental:
+    """
+    Detector de Canny para video que recalcula los gradientes solo donde cambia el cuadro.
+
+    Los gradientes Sobel (la parte costosa y local) se mantienen con un
+    ProcesadorIncremental. La supresión no máxima y la histéresis se aplican
+    sobre el cuadro completo: la magnitud se normaliza con el máximo global y la
+    histéresis propaga bordes sin límite de distancia, así que no son locales.
+    El resultado es idéntico al de filters.canny sobre el mismo cuadro (array).
+
+    Parámetros:
+    -----------
+    umbral_bajo, umbral_alto : int
+        Umbrales de histéresis, como en filters.canny.
+    backend : str, opcional
+        Backend de filtros a usar (ver filters.usar_backend).
+    tamano_bloque, tolerancia, umbral_completo :
+        Ver ProcesadorIncremental.
+    """
+
+    def __init__(self, umbral_bajo: int = 50, umbral_alto: int = 150, backend: str | None = None,
+                 tamano_bloque: int = 32, tolerancia: int = 0, umbral_completo: float = 0.5):
+        self.umbral_bajo = umbral_bajo
+        self.umbral_alto = umbral_alto
+        self.backend = backend
+
+        # Buffers de las etapas sobre el cuadro completo (forma fija)
+        self._workspace = Workspace()
+        self._forma = None
+        self.gradientes = ProcesadorIncremental(self._calcular_gradientes, (1, 1), tamano_bloque,
+                                                tolerancia, umbral_completo)
+
+    @property
+    def fraccion_recalculada(self) -> float:
+        return self.gradientes.fraccion_recalculada
+
+    def reiniciar(self) -> None:
+        self.gradientes.reiniciar()
+        self._workspace.clear()
+        self._forma = None
+
+    def _calcular_gradientes(self, region: np.ndarray) -> np.ndarray:
+        # Sin workspace persistente: las regiones cambiadas varían de forma
+        return filters.gradientes_canny(region, self.backend)
+
+    def procesar(self, cuadro: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Detecta los bordes de un cuadro (array RGB o en escala de grises).
+        """
+        gradientes = self.gradientes.procesar(cuadro)
+        if gradientes.shape[:2] != self._forma:
+            self._workspace.clear()
+            self._forma = gradientes.shape[:2]
+
+        return filters.canny_desde_gradientes(gradientes, self.umbral_bajo, self.umbral_alto,
+                                              self.backend, out, self._workspace)
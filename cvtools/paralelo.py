@@ -0,0 +1,235 @@
+import functools
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from cvtools import filters
+from cvtools.workspace import Workspace, preparar_salida
+
+
+def _adjuntar_bloque(nombre: str) -> shared_memory.SharedMemory:
+    """
+    Abre desde un worker un bloque creado por el proceso principal.
+
+    El bloque pertenece al proceso principal, que es quien lo libera. Antes de
+    Python 3.13 no se puede abrir sin registrarlo en el resource_tracker, pero
+    los workers del pool comparten el tracker del proceso principal, donde el
+    nombre ya está registrado, así que el registro repetido no tiene efecto.
+    """
+    try:
+        return shared_memory.SharedMemory(name=nombre, track=False)  # Python >= 3.13
+    except TypeError:
+        return shared_memory.SharedMemory(name=nombre)
+
+
+def _procesar_tile(funcion, entradas: list, salida: tuple, region: tuple, radio: tuple) -> None:
+    """
+    Se ejecuta en el worker: aplica funcion a un tile (con halo) y escribe en la salida compartida.
+
+    entradas y salida son tuplas (nombre del bloque, forma, dtype).
+    """
+    bloques = []
+    try:
+        vistas = []
+        for nombre, forma, dtype in entradas:
+            bloque = _adjuntar_bloque(nombre)
+            bloques.append(bloque)
+            vistas.append(np.ndarray(forma, dtype=dtype, buffer=bloque.buf))
+
+        bloque = _adjuntar_bloque(salida[0])
+        bloques.append(bloque)
+        destino = np.ndarray(salida[1], dtype=salida[2], buffer=bloque.buf)
+
+        filters.procesar_region(funcion, vistas, region, radio, destino)
+
+        # Soltar las vistas antes de cerrar los bloques (close falla con vistas vivas)
+        del vistas, destino
+    finally:
+        for bloque in bloques:
+            try:
+                bloque.close()
+            except BufferError:
+                pass
+
+
+class EjecutorProcesos:
+    """
+    Ejecuta operaciones locales por tiles en un pool de procesos con memoria compartida.
+
+    Las imágenes de entrada y de salida se colocan en bloques de
+    multiprocessing.shared_memory: los workers leen su tile (con un halo del radio
+    de la operación) y escriben el resultado directamente en el bloque de salida,
+    así que no se serializan arrays con pickle en ningún sentido.
+
+    Los bloques se liberan siempre al terminar cada llamada, también si un worker
+    lanza una excepción o muere; en ese caso el pool se vuelve a crear en la
+    siguiente llamada.
+
+    Parámetros:
+    -----------
+    procesos : int, opcional
+        Número de procesos del pool (por defecto, uno por CPU).
+    tamano_tile : int
+        Lado de los tiles en los que se divide la imagen.
+    """
+
+    def __init__(self, procesos: int | None = None, tamano_tile: int = 256):
+        if tamano_tile < 1:
+            raise ValueError("El tamaño de tile debe ser positivo")
+
+        self.procesos = procesos
+        self.tamano_tile = tamano_tile
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.cerrar()
+
+    def cerrar(self) -> None:
+        """
+        Termina el pool de procesos.
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _obtener_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.procesos)
+        return self._pool
+
+    def mapear(self, funcion, entradas, radio: tuple = (0, 0), canales: tuple | None = None,
+               dtype=None, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Aplica una operación local a una o varias imágenes, tile por tile, en paralelo.
+
+        Parámetros:
+        -----------
+        funcion : callable
+            Operación que recibe un array por entrada (todos con el mismo alto y
+            ancho) y retorna un array con ese alto y ancho. Debe poder serializarse
+            con pickle (función de módulo o functools.partial de una).
+        entradas : np.ndarray o list of np.ndarray
+            Imágenes de entrada (se copian una vez a memoria compartida).
+        radio : tuple
+            Radio (filas, columnas) de la operación; cada tile se calcula con ese halo.
+        canales : tuple, opcional
+            Dimensiones finales de la salida (ej. () para gris, (3,) para RGB).
+        dtype : opcional
+            Tipo de la salida. Si canales o dtype son None se infieren aplicando
+            funcion a una esquina pequeña de la imagen.
+        out : np.ndarray, opcional
+            Array donde copiar el resultado final desde la memoria compartida.
+
+        Retorna:
+        --------
+        np.ndarray
+            Resultado de la operación sobre la imagen completa.
+        """
+        if isinstance(entradas, np.ndarray):
+            entradas = [entradas]
+        entradas = [np.asarray(entrada) for entrada in entradas]
+
+        alto, ancho = entradas[0].shape[:2]
+        if any(entrada.shape[:2] != (alto, ancho) for entrada in entradas):
+            raise ValueError("Todas las entradas deben tener el mismo alto y ancho")
+
+        if canales is None or dtype is None:
+            esquina = funcion(*(entrada[:min(alto, 2 * radio[0] + 2), :min(ancho, 2 * radio[1] + 2)]
+                                for entrada in entradas))
+            canales = esquina.shape[2:] if canales is None else canales
+            dtype = esquina.dtype if dtype is None else dtype
+
+        forma_salida = (alto, ancho) + tuple(canales)
+        out = preparar_salida(out, forma_salida, dtype)
+
+        bloques = []
+        futuros = []
+        try:
+            # Copiar las entradas a memoria compartida y reservar la salida
+            descriptores = []
+            for entrada in entradas:
+                bloque = shared_memory.SharedMemory(create=True, size=max(entrada.nbytes, 1))
+                bloques.append(bloque)
+                np.ndarray(entrada.shape, dtype=entrada.dtype, buffer=bloque.buf)[...] = entrada
+                descriptores.append((bloque.name, entrada.shape, entrada.dtype.str))
+
+            tamano = int(np.prod(forma_salida)) * np.dtype(dtype).itemsize
+            bloque_salida = shared_memory.SharedMemory(create=True, size=max(tamano, 1))
+            bloques.append(bloque_salida)
+            salida = (bloque_salida.name, forma_salida, np.dtype(dtype).str)
+
+            pool = self._obtener_pool()
+            paso = self.tamano_tile
+            for f0 in range(0, alto, paso):
+                for c0 in range(0, ancho, paso):
+                    region = (f0, min(f0 + paso, alto), c0, min(c0 + paso, ancho))
+                    futuros.append(pool.submit(_procesar_tile, funcion, descriptores, salida,
+                                               region, tuple(radio)))
+
+            hechos, _ = wait(futuros, return_when=FIRST_EXCEPTION)
+            for futuro in hechos:
+                futuro.result()  # propaga la excepción del worker, si la hubo
+            wait(futuros)
+
+            resultado = np.ndarray(forma_salida, dtype=dtype, buffer=bloque_salida.buf)
+            np.copyto(out, resultado)
+            del resultado
+
+            return out
+        except BrokenProcessPool:
+            # Un worker murió: el pool ya no sirve, se recrea en la próxima llamada
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            raise
+        finally:
+            for futuro in futuros:
+                futuro.cancel()
+            # Esperar a los tiles en curso para no liberar memoria que aún se escribe
+            wait(futuros)
+            # Cada bloque por separado: un fallo al cerrar uno no impide liberar los demás
+            for bloque in bloques:
+                try:
+                    bloque.close()
+                except BufferError:
+                    pass
+                try:
+                    bloque.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def convolucion(self, imagen: np.ndarray, kernel: np.ndarray, backend: str | None = None,
+                    out: np.ndarray | None = None) -> np.ndarray:
+        """
+        filters.convolucion por tiles en paralelo; el resultado es idéntico.
+        """
+        imagen = np.asarray(imagen)
+        kernel = np.asarray(kernel)
+        k_h, k_w = kernel.shape
+        funcion = functools.partial(filters.convolucion, kernel=kernel, backend=backend)
+        return self.mapear(funcion, imagen, (k_h // 2, k_w // 2), imagen.shape[2:], np.uint8, out)
+
+    def canny(self, imagen: np.ndarray, umbral_bajo: int = 50, umbral_alto: int = 150,
+              backend: str | None = None, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        filters.canny con los gradientes y la supresión no máxima por tiles en paralelo.
+
+        La normalización de la magnitud (usa el máximo global) y la histéresis
+        (propaga bordes sin límite de distancia) se hacen en el proceso principal.
+        El resultado es idéntico al de filters.canny sobre el mismo array.
+        """
+        imagen = np.asarray(imagen)
+        workspace = Workspace()
+
+        gradientes = self.mapear(functools.partial(filters.gradientes_canny, backend=backend), imagen,
+                                 (1, 1), (2,), np.uint8)
+        magnitud, ang = filters.magnitud_angulo(gradientes, workspace)
+
+        Z = self.mapear(functools.partial(filters.supresion_no_maxima, backend=backend), [magnitud, ang],
+                        (1, 1), (), np.float32)
+
+        return filters.umbral_histeresis(Z, umbral_bajo, umbral_alto, backend, out, workspace)
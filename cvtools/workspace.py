@@ -0,0 +1,78 @@
+import numpy as np
+
+
+class Workspace:
+    """
+    Buffers temporales reutilizables entre llamadas (parámetro workspace=).
+
+    Cada buffer se identifica por su nombre, forma y tipo, y se reserva solo la
+    primera vez que se pide. Así, un bucle que procesa cuadros del mismo tamaño
+    con el mismo Workspace no reserva memoria nueva después de la primera
+    iteración, aunque alterne operaciones sobre imágenes en color y en gris.
+    Si el tamaño de los cuadros cambia, clear() libera los buffers anteriores.
+
+    Un Workspace no debe compartirse entre hilos que lo usen a la vez.
+    """
+
+    def __init__(self):
+        self._buffers = {}
+        self._cache = {}
+
+    def get(self, nombre: str, forma: tuple, dtype) -> np.ndarray:
+        """
+        Retorna el buffer `nombre` con la forma y tipo pedidos (contenido sin inicializar).
+        """
+        clave = (nombre, tuple(forma), np.dtype(dtype))
+
+        buffer = self._buffers.get(clave)
+        if buffer is None:
+            buffer = np.empty(clave[1], dtype=clave[2])
+            self._buffers[clave] = buffer
+
+        return buffer
+
+    def cached(self, nombre: str, clave, calcular):
+        """
+        Retorna el valor guardado en `nombre` si se calculó con la misma clave;
+        si no, lo calcula con calcular() y lo guarda.
+        """
+        guardado = self._cache.get(nombre)
+        if guardado is None or guardado[0] != clave:
+            guardado = (clave, calcular())
+            self._cache[nombre] = guardado
+
+        return guardado[1]
+
+    def clear(self) -> None:
+        """
+        Libera todos los buffers y valores guardados.
+        """
+        self._buffers.clear()
+        self._cache.clear()
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memoria ocupada por los buffers, en bytes.
+        """
+        return sum(buffer.nbytes for buffer in self._buffers.values())
+
+
+def preparar_salida(out: np.ndarray | None, forma: tuple, dtype) -> np.ndarray:
+    """
+    Retorna `out` tras comprobar su forma y tipo, o un array nuevo si es None.
+    """
+    forma = tuple(forma)
+    dtype = np.dtype(dtype)
+
+    if out is None:
+        return np.empty(forma, dtype=dtype)
+
+    if not isinstance(out, np.ndarray):
+        raise TypeError("El parámetro out debe ser un array NumPy")
+
+    if out.shape != forma or out.dtype != dtype:
+        raise ValueError(f"out debe tener forma {forma} y tipo {dtype}, "
+                         f"se recibió forma {out.shape} y tipo {out.dtype}")
+
+    return out
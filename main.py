@@ -1,6 +1,6 @@
 import numpy as np
 from PIL import Image
-from tests import test_color, test_camera, test_filters
+from tests import test_color, test_camera, test_filters, test_aio, test_incremental, test_paralelo, test_importacion
 
 # Parámetros para la prueba de conversión de color
 sc = "yuv"      # espacio de color: 'hsv', 'lab', 'yuv'
@@ -23,23 +23,62 @@ umbral_alto = 150
 
 
 
-# Ejecutar las pruebas
-#-------------------------------
-# Pruebas de conversión de color (↓ descomentar para ejecutar ↓)
-#test_color.test_rgb(n, plot)
-#test_color.test_rgb_to_any(sc, n, plot)
-#test_color.test_histogram(n)
-#test_color.test_cuantizacion(n, k)
-#test_color.test_cuantizacion_con_tamano(n, k)
+# Las pruebas van dentro de este bloque: en Windows y macOS los pools de procesos
+# (test_aio con "process", test_paralelo) arrancan los hijos con spawn, y cada
+# hijo vuelve a importar este archivo. Sin el guard, las pruebas se ejecutarían
+# otra vez en cada hijo y el pool fallaría (RuntimeError / BrokenProcessPool).
+if __name__ == "__main__":
+    # Ejecutar las pruebas
+    #-------------------------------
+    # Pruebas de conversión de color (↓ descomentar para ejecutar ↓)
+    #test_color.test_rgb(n, plot)
+    #test_color.test_rgb_to_any(sc, n, plot)
+    #test_color.test_histogram(n)
+    #test_color.test_cuantizacion(n, k)
+    #test_color.test_cuantizacion_con_tamano(n, k)
+    #test_color.test_sin_reservas()
+    #test_color.test_convertir_espacios()
 
-#-------------------------------
-# Prueba de distorsión camara (↓ descomentar para ejecutar ↓)
-#test_camera.test_radial_distortion(n, k1, k2)
-#test_camera.test_focal_distortion(n, f)
+    #-------------------------------
+    # Prueba de distorsión camara (↓ descomentar para ejecutar ↓)
+    #test_camera.test_radial_distortion(n, k1, k2)
+    #test_camera.test_focal_distortion(n, f)
+    #test_camera.test_sin_reservas(k1, k2, f)
 
-#-------------------------------
-# Prueba de filtros (↓ descomentar para ejecutar ↓)
-#test_filters.test_convolucion(n, kernel)
-#test_filters.test_sobel(n)
-#test_filters.test_canny(n, umbral_bajo, umbral_alto)
-#test_filters.test_laplacian(n)
\ No newline at end of file
+    #-------------------------------
+    # Prueba de filtros (↓ descomentar para ejecutar ↓)
+    #test_filters.test_convolucion(n, kernel)
+    #test_filters.test_sobel(n)
+    #test_filters.test_canny(n, umbral_bajo, umbral_alto)
+    #test_filters.test_canny_auto(n, "otsu")
+    #test_filters.test_laplacian(n)
+    #test_filters.test_backends()
+    #test_filters.test_piramide()
+    #test_filters.test_sin_reservas()
+    #test_filters.test_convolucion_entera()
+    #test_filters.test_umbrales_automaticos()
+    #test_filters.test_array_y_pil()
+    #test_filters.test_formas_de_array()
+    #test_filters.test_numba_roto()
+
+    #-------------------------------
+    # Pruebas de la API asíncrona (↓ descomentar para ejecutar ↓)
+    #test_aio.test_process_many("thread")
+    #test_aio.test_load_test("process")
+
+    #-------------------------------
+    # Pruebas de filtrado incremental de video (↓ descomentar para ejecutar ↓)
+    #test_incremental.test_convolucion_incremental(16)
+    #test_incremental.test_canny_incremental(16)
+    #test_incremental.test_memoria_acotada()
+
+    #-------------------------------
+    # Pruebas del ejecutor multiproceso (↓ descomentar para ejecutar ↓)
+    #test_paralelo.test_ejecutor(2, 128)
+    #test_paralelo.test_limpieza_tras_fallo(2, 128)
+
+    #-------------------------------
+    # Presupuesto de tiempo de importación (↓ descomentar para ejecutar ↓)
+    #test_importacion.test_tiempo_importacion()
+
+    pass  # (descomentar arriba las pruebas a ejecutar)
@@ -0,0 +1,42 @@
+import asyncio
+import numpy as np
+from PIL import Image
+from cvtools import filters, camera
+from cvtools.aio import AsyncProcessor, load_test
+
+def imagenes_aleatorias(cantidad: int, tamano=(48, 64)):
+    rng = np.random.default_rng(0)
+    return [Image.fromarray(rng.integers(0, 256, (*tamano, 3), dtype=np.uint8), "RGB")
+            for _ in range(cantidad)]
+
+def test_process_many(executor="thread", cantidad=6, max_concurrency=2):
+    imagenes = imagenes_aleatorias(cantidad)
+
+    async def principal():
+        async with AsyncProcessor(executor, max_workers=2, max_concurrency=max_concurrency) as procesador:
+            resultados = {}
+            async for indice, bordes in procesador.process_many(filters.canny, imagenes, backend="numpy"):
+                resultados[indice] = bordes
+
+            distorsionada = await procesador.apply_focal_distortion(np.array(imagenes[0]), 0.5)
+        return resultados, distorsionada
+
+    resultados, distorsionada = asyncio.run(principal())
+
+    assert sorted(resultados) == list(range(cantidad))
+    for indice, bordes in resultados.items():
+        assert np.array_equal(bordes, filters.canny(imagenes[indice], backend="numpy"))
+    assert np.array_equal(distorsionada, camera.apply_focal_distortion(np.array(imagenes[0]), 0.5))
+
+def test_load_test(executor="thread", peticiones=16, clientes=4):
+    imagenes = imagenes_aleatorias(peticiones)
+
+    async def principal():
+        async with AsyncProcessor(executor, max_workers=2) as procesador:
+            return await load_test(procesador, filters.canny, imagenes, clients=clientes, backend="numpy")
+
+    metricas = asyncio.run(principal())
+    print(metricas)
+
+    assert metricas["peticiones"] == peticiones
+    assert metricas["p50_ms"] <= metricas["p99_ms"]
@@ -47,4 +47,32 @@ def test_focal_distortion(n=1, f=500):
     plt.axis('off')
 
     plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    plt.show()
+
+def test_sin_reservas(k1=0.3, k2=-0.1, f=0.5, cuadros=3):
+    import tracemalloc
+    from cvtools.camera import apply_radial_distortion, apply_focal_distortion
+    from cvtools.workspace import Workspace
+
+    rng = np.random.default_rng(0)
+    cuadro = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+
+    workspace = Workspace()
+    salida = np.empty_like(cuadro)
+
+    # Primer cuadro: se calculan y guardan los mapas de remapeo
+    apply_radial_distortion(cuadro, k1, k2, out=salida, workspace=workspace)
+    assert np.array_equal(salida, apply_radial_distortion(cuadro, k1, k2))
+    apply_focal_distortion(cuadro, f, out=salida, workspace=workspace)
+    assert np.array_equal(salida, apply_focal_distortion(cuadro, f))
+
+    # Cuadros siguientes: ninguna reserva del tamaño de un plano de la imagen
+    tracemalloc.start()
+    for _ in range(cuadros):
+        apply_radial_distortion(cuadro, k1, k2, out=salida, workspace=workspace)
+        apply_focal_distortion(cuadro, f, out=salida, workspace=workspace)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"Pico de memoria por cuadro: {pico} bytes")
+    assert pico < cuadro.shape[0] * cuadro.shape[1]
@@ -1,7 +1,6 @@
 import numpy as np
-import matplotlib.pyplot as plt
 from PIL import Image
-from cvtools import color, plotting
+from cvtools import color
 
 def imagen(n: int):
     if n == 1: return Image.open(r'.\data\veneno-roadster.jpg')
@@ -11,6 +10,7 @@ def test_rgb(n=1, plot=False):
     imagen_color = imagen(n)
     
     if plot:
+        from cvtools import plotting
         plotting.mostrar_canales(imagen_color.split(), "rgb")
     else:
         for canal in imagen_color.split():
@@ -31,6 +31,8 @@ def test_histogram(n=1):
     color.histograma_colores(imagen_color)
 
 def test_cuantizacion(n=1, k=[16, 64]):
+    import matplotlib.pyplot as plt
+
     imagen_color = imagen(n)
 
     if len(k) < 3:
@@ -62,9 +64,9 @@ def test_cuantizacion(n=1, k=[16, 64]):
             plt.axis("off")
             plt.show()
 
-import matplotlib.pyplot as plt
-
 def test_cuantizacion_con_tamano(n=1, k=[16, 64]):
+    import matplotlib.pyplot as plt
+
     imagen_color = imagen(n)  # suponiendo que devuelve PIL.Image
     imagen_original, tamano_original = color.reducir_peso(imagen_color, 256)  # 256 ≈ sin pérdida fuerte
 
@@ -99,3 +101,67 @@ def test_cuantizacion_con_tamano(n=1, k=[16, 64]):
             plt.axis("off")
             plt.show()
 
+
+
+def test_sin_reservas(cuadros=3):
+    import tracemalloc
+    from cvtools.workspace import Workspace
+
+    rng = np.random.default_rng(0)
+    cuadro = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+
+    workspace = Workspace()
+    canales = np.empty((3,) + cuadro.shape[:2], dtype=np.uint8)
+
+    # Primer cuadro: se reservan los buffers del workspace
+    h, s, v = color.rgb_a_hsv(cuadro, out=canales, workspace=workspace)
+    for canal, esperado in zip((h, s, v), color.rgb_a_hsv(Image.fromarray(cuadro))):
+        assert np.array_equal(canal, esperado)
+
+    # Cuadros siguientes: ninguna reserva del tamaño de un plano de la imagen
+    tracemalloc.start()
+    for _ in range(cuadros):
+        color.rgb_a_hsv(cuadro, out=canales, workspace=workspace)
+        color.rgb_a_lab(cuadro, out=canales, workspace=workspace)
+        color.rgb_a_yuv(cuadro, out=canales, workspace=workspace)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"Pico de memoria por cuadro: {pico} bytes")
+    assert pico < canales[0].nbytes
+
+
+def test_convertir_espacios(espacios=("hsv", "lab", "yuv"), repeticiones=20):
+    import time
+    import cv2
+    from cvtools.workspace import Workspace
+
+    rng = np.random.default_rng(0)
+    imagen_color = Image.fromarray(rng.integers(0, 256, (480, 640, 3), dtype=np.uint8))
+
+    workspace = Workspace()
+    planar = np.empty((3 * len(espacios), imagen_color.height, imagen_color.width), dtype=np.uint8)
+    canales = color.convertir_espacios(imagen_color, espacios, out=planar, workspace=workspace)
+
+    # Mismo resultado que las conversiones por separado, como vistas del array planar
+    convertir = {"hsv": color.rgb_a_hsv, "lab": color.rgb_a_lab, "yuv": color.rgb_a_yuv}
+    for espacio in espacios:
+        for canal, esperado in zip(canales[espacio], convertir[espacio](imagen_color)):
+            assert np.array_equal(canal, esperado)
+            assert np.shares_memory(canal, planar)
+
+    # Comparar con convertir por separado y separar con cv2.split
+    codigos = {"hsv": cv2.COLOR_RGB2HSV, "lab": cv2.COLOR_RGB2LAB, "yuv": cv2.COLOR_RGB2YUV}
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        for espacio in espacios:
+            cv2.split(cv2.cvtColor(np.array(imagen_color), codigos[espacio]))
+    separado = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        color.convertir_espacios(imagen_color, espacios, out=planar, workspace=workspace)
+    fusionado = time.perf_counter() - inicio
+
+    print(f"Por separado: {1000 * separado / repeticiones:.2f} ms, "
+          f"fusionado: {1000 * fusionado / repeticiones:.2f} ms")
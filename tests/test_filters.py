@@ -81,6 +81,27 @@ def test_canny(n=1, umbral_bajo=50, umbral_alto=150):
     plt.tight_layout()
     plt.show()
 
+def test_canny_auto(n=1, metodo="mediana"):
+    import matplotlib.pyplot as plt
+
+    imagen_color = imagen(n)
+    imagen_canny, umbral_bajo, umbral_alto = filters.canny_auto(imagen_color, metodo)
+
+    plt.figure(figsize=(10, 5))
+
+    plt.subplot(1, 2, 1)
+    plt.imshow(imagen_color)
+    plt.title('Imagen Original')
+    plt.axis('off')
+
+    plt.subplot(1, 2, 2)
+    plt.imshow(imagen_canny, cmap='gray')
+    plt.title(f'Canny automático ({metodo}: {umbral_bajo:.0f}/{umbral_alto:.0f})')
+    plt.axis('off')
+
+    plt.tight_layout()
+    plt.show()
+
 def test_laplacian(n=1):
     import matplotlib.pyplot as plt
 
@@ -100,4 +121,217 @@ def test_laplacian(n=1):
     plt.axis('off')
 
     plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    plt.show()
+
+def test_backends(repeticiones=3):
+    for nombre in filters.backends_disponibles():
+        try:
+            resultados = filters.verificar_backend(nombre, repeticiones=repeticiones)
+        except RuntimeError as error:
+            # Backend opcional instalado pero roto (ej. numba): debe quitarse del registro
+            print(error)
+            assert nombre not in filters.backends_disponibles()
+            continue
+        print(f"Backend '{nombre}':", resultados)
+        assert all(resultados.values()), f"El backend '{nombre}' no coincide con la referencia"
+
+
+def test_piramide(niveles=4, backend="numpy"):
+    rng = np.random.default_rng(0)
+    imagen_gris = Image.fromarray(rng.integers(0, 256, (96, 128), dtype=np.uint8), "L")
+
+    piramide = filters.construir_piramide(imagen_gris, niveles, backend)
+    dog = filters.piramide_laplaciana(piramide)
+    log = filters.respuestas_log(piramide, backend)
+    bordes = filters.bordes_piramide(piramide, backend=backend)
+
+    for k, (g, d, l, b) in enumerate(zip(piramide["gaussiana"], dog, log, bordes)):
+        print(f"Nivel {k}: {g.shape}, DoG [{d.min():.1f}, {d.max():.1f}], "
+              f"LoG [{l.min():.1f}, {l.max():.1f}], bordes={int((b == 255).sum())}")
+        assert g.shape == (-(-96 // 2**k), -(-128 // 2**k))
+        assert d.shape == l.shape == b.shape == g.shape
+        assert l.min() < 0 < l.max()
+
+    # El nivel 0 reproduce canny() sobre la imagen original
+    assert np.array_equal(bordes[0], filters.canny(imagen_gris, backend=backend))
+
+    # Como los demás filtros, acepta arrays NumPy con el mismo resultado que PIL
+    imagen_rgb = rng.integers(0, 256, (48, 64, 3), dtype=np.uint8)
+    for imagen_array in (np.asarray(imagen_gris), imagen_rgb):
+        desde_array = filters.construir_piramide(imagen_array, niveles, backend)
+        desde_pil = filters.construir_piramide(Image.fromarray(imagen_array), niveles, backend)
+        for clave in ("gaussiana", "suavizada"):
+            assert all(np.array_equal(a, b) for a, b in zip(desde_array[clave], desde_pil[clave]))
+
+
+def test_sin_reservas(backend="numpy", cuadros=3):
+    import tracemalloc
+    from cvtools.workspace import Workspace
+
+    rng = np.random.default_rng(0)
+    cuadro = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+    kernel = np.array([[0, 2, 0],
+                       [2, 8, 2],
+                       [0, 2, 0]], dtype=np.float32)
+
+    workspace = Workspace()
+    salida_color = np.empty_like(cuadro)
+    salida_gris = np.empty(cuadro.shape[:2], dtype=np.uint8)
+
+    def procesar():
+        filters.convolucion(cuadro, kernel, backend, out=salida_color, workspace=workspace)
+        filters.sobel_x(cuadro, backend, out=salida_gris, workspace=workspace)
+        filters.canny(cuadro, 50, 150, backend, out=salida_gris, workspace=workspace)
+
+    # Primer cuadro: se reservan los buffers del workspace
+    procesar()
+    assert np.array_equal(salida_color, filters.convolucion(cuadro, kernel, backend))
+    assert np.array_equal(salida_gris, filters.canny(cuadro, 50, 150, backend))
+
+    # Cuadros siguientes: ninguna reserva del tamaño de un plano de la imagen
+    tracemalloc.start()
+    for _ in range(cuadros):
+        procesar()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"Pico de memoria por cuadro ({backend}): {pico} bytes")
+    assert pico < salida_gris.nbytes
+
+
+def test_convolucion_entera(backend="numpy"):
+    rng = np.random.default_rng(0)
+    imagen_color = rng.integers(0, 256, (40, 56, 3), dtype=np.uint8)
+
+    casos = [
+        (filters.KERNEL_SOBEL_X, np.int16),
+        (filters.KERNEL_LAPLACIANO, np.int16),
+        (np.array([[0, 2, 0], [2, 8, 2], [0, 2, 0]], dtype=np.float32), np.int16),
+        (np.full((3, 3), 200, dtype=np.float32), np.int32),       # desborda int16
+        (np.full((3, 3), 1e7, dtype=np.float32), None),           # desborda int32 -> float
+        (np.full((3, 3), 1 / 9, dtype=np.float32), None),         # no entero -> float
+    ]
+
+    for kernel, acumulador in casos:
+        assert filters._acumulador_entero(imagen_color, kernel) == acumulador
+        # El camino entero es exacto: coincide con la referencia en float
+        resultado = filters.convolucion(imagen_color, kernel, backend)
+        esperado = filters.convolucion(imagen_color, kernel, "referencia")
+        print(f"Acumulador {acumulador}: diferencia máxima",
+              np.abs(resultado.astype(np.int16) - esperado).max())
+        if acumulador is not None:
+            assert np.array_equal(resultado, esperado)
+
+
+def test_umbrales_automaticos(backend="numpy"):
+    from cvtools.workspace import Workspace
+
+    # Cuadrado claro sobre fondo con ruido: bordes fuertes y textura débil
+    rng = np.random.default_rng(0)
+    imagen_color = rng.integers(60, 90, (120, 160, 3), dtype=np.uint8)
+    imagen_color[30:90, 40:120] += 120
+
+    for metodo in filters.METODOS_UMBRAL:
+        bordes, umbral_bajo, umbral_alto = filters.canny_auto(imagen_color, metodo, backend=backend)
+        print(f"{metodo}: umbrales {umbral_bajo:.1f} / {umbral_alto:.1f}, "
+              f"{100 * np.mean(bordes == filters.FUERTE):.1f}% de píxeles de borde")
+
+        # El histograma de un solo recorrido coincide con np.histogram de la magnitud
+        workspace = Workspace()
+        gris = filters._a_gris(imagen_color, workspace)
+        operaciones = filters._resolver_backend(backend)
+        magnitud, _ = filters._magnitud_angulo(*filters._gradientes_sobel(gris, operaciones, workspace),
+                                               workspace)
+        esperado, _ = np.histogram(magnitud, bins=256, range=(0, 256))
+        assert np.array_equal(filters._histograma_magnitud(magnitud), esperado)
+
+        # Mismo resultado que canny con esos umbrales, y el cuadrado queda detectado
+        assert 0 < umbral_bajo <= umbral_alto <= 255
+        assert np.array_equal(bordes, filters.canny(imagen_color, umbral_bajo, umbral_alto, backend))
+        assert bordes[30, 50:110].any() and bordes[40:80, 39].any()
+
+    # sigma fuera de [0, 1) invertiría los umbrales
+    for sigma in (-0.5, 1.0):
+        try:
+            filters.canny_auto(imagen_color, "mediana", sigma, backend)
+            lanzado = False
+        except ValueError:
+            lanzado = True
+        assert lanzado, f"Se esperaba ValueError con sigma={sigma}"
+
+    # Imagen sin gradiente: no se marca ningún borde, sin avisos de 0/0
+    import warnings
+    assert filters.umbrales_automaticos(np.zeros(256)) == (255.0, 255.0)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        bordes, umbral_bajo, umbral_alto = filters.canny_auto(np.full((40, 50, 3), 7, np.uint8),
+                                                              backend=backend)
+    assert (umbral_bajo, umbral_alto) == (255.0, 255.0)
+    assert not bordes.any()
+
+
+def test_array_y_pil():
+    rng = np.random.default_rng(0)
+    imagen_rgb = rng.integers(0, 256, (60, 80, 3), dtype=np.uint8)
+    imagen_rgba = rng.integers(0, 256, (60, 80, 4), dtype=np.uint8)
+
+    # El mismo cuadro debe dar el mismo resultado como array NumPy o como imagen PIL
+    for backend in filters.backends_disponibles():
+        for imagen_array in (imagen_rgb, imagen_rgba):
+            imagen_pil = Image.fromarray(imagen_array)
+            for operacion in (filters.sobel_x, filters.sobel_y, filters.filtro_laplaciano, filters.canny):
+                assert np.array_equal(operacion(imagen_array, backend=backend),
+                                      operacion(imagen_pil, backend=backend)), (backend, operacion.__name__)
+
+
+
+def test_formas_de_array(backend="numpy"):
+    rng = np.random.default_rng(0)
+    imagen_rgb = rng.integers(0, 256, (60, 80, 3), dtype=np.uint8)
+    gris = imagen_rgb[:, :, 0]
+    operaciones = (filters.sobel_x, filters.sobel_y, filters.filtro_laplaciano, filters.canny,
+                   lambda imagen, backend: filters.canny_auto(imagen, backend=backend)[0])
+
+    for operacion in operaciones:
+        # Un canal (alto, ancho, 1) se trata como escala de grises
+        assert np.array_equal(operacion(gris[:, :, None], backend=backend), operacion(gris, backend=backend))
+
+        # Tipos que cv2.cvtColor no admite (float64, int32) se convierten a float32
+        esperado = operacion(imagen_rgb.astype(np.float32), backend=backend)
+        for dtype in (np.float64, np.int32):
+            assert np.array_equal(operacion(imagen_rgb.astype(dtype), backend=backend), esperado)
+
+        # Otro número de canales: error claro
+        try:
+            operacion(imagen_rgb[:, :, :2], backend=backend)
+            lanzado = False
+        except ValueError:
+            lanzado = True
+        assert lanzado, "Se esperaba ValueError con 2 canales"
+
+
+def test_numba_roto():
+    import subprocess
+    import sys
+
+    # numba "instalado" pero imposible de importar: se simula en un intérprete nuevo
+    codigo = """
+import sys
+import numpy as np
+from cvtools import filters
+filters._BACKENDS.setdefault("numba", filters._BACKENDS["numpy"] | {
+    "convolucion": filters._convolucion_numba})
+filters.usar_backend("numba")
+sys.modules["numba"] = None
+filters._bucles_numba.cache_clear()
+try:
+    filters.convolucion(np.zeros((8, 8), np.uint8), np.full((3, 3), 0.5, np.float32))
+except RuntimeError as error:
+    print(error)
+assert "numba" not in filters.backends_disponibles()
+assert filters.backend_actual() == filters.BACKEND_REFERENCIA
+"""
+    resultado = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True)
+    print(resultado.stdout, resultado.stderr)
+    assert resultado.returncode == 0
+    assert "no está disponible" in resultado.stdout
@@ -0,0 +1,53 @@
+import subprocess
+import sys
+
+# Presupuesto de tiempo de importación (ms) de los módulos de cálculo. Incluye
+# numpy, OpenCV y PIL, y deja margen para máquinas lentas; importar matplotlib
+# o numba de forma anticipada lo supera.
+PRESUPUESTO_MS = {
+    "cvtools.workspace": 300,
+    "cvtools.filters": 500,
+    "cvtools.camera": 400,
+    "cvtools.color": 500,
+    "cvtools.incremental": 500,
+    "cvtools.paralelo": 600,
+    "cvtools.aio": 700,
+}
+
+# Módulos que solo deben cargarse al graficar o al usar el backend numba
+PROHIBIDOS = ("matplotlib", "numba", "cvtools.plotting")
+
+def tiempo_importacion(modulo: str) -> tuple[float, set]:
+    """
+    Importa el módulo en un intérprete nuevo con `python -X importtime`.
+
+    Retorna el tiempo acumulado en ms y el conjunto de módulos importados.
+    """
+    salida = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+                            capture_output=True, text=True, check=True).stderr
+
+    tiempo = None
+    importados = set()
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        _, acumulado, nombre = linea.split("|")
+        nombre = nombre.strip()
+        importados.add(nombre)
+        if nombre == modulo and acumulado.strip().isdigit():
+            tiempo = int(acumulado) / 1000
+
+    return tiempo, importados
+
+def test_tiempo_importacion(repeticiones=3):
+    for modulo, presupuesto in PRESUPUESTO_MS.items():
+        mediciones = [tiempo_importacion(modulo) for _ in range(repeticiones)]
+        tiempo = min(t for t, _ in mediciones)
+        importados = mediciones[0][1]
+
+        print(f"{modulo:22s} {tiempo:7.1f} ms (presupuesto {presupuesto} ms)")
+
+        cargados = [nombre for nombre in importados
+                    if any(nombre == p or nombre.startswith(p + ".") for p in PROHIBIDOS)]
+        assert not cargados, f"{modulo} importa {sorted(cargados)[:5]} al cargarse"
+        assert tiempo <= presupuesto, f"{modulo} tarda {tiempo:.1f} ms en importarse"
@@ -0,0 +1,58 @@
+import numpy as np
+from cvtools import filters
+from cvtools.incremental import convolucion_incremental, CannyIncremental
+
+def video_sintetico(cuadros=5, tamano=(120, 160), lado=12):
+    """Escena estática con ruido fijo y un cuadrado que se desplaza."""
+    rng = np.random.default_rng(0)
+    fondo = rng.integers(0, 256, (*tamano, 3), dtype=np.uint8)
+    for t in range(cuadros):
+        cuadro = fondo.copy()
+        fila, columna = 20 + 3 * t, 30 + 5 * t
+        cuadro[fila:fila + lado, columna:columna + lado] = 255
+        yield cuadro
+
+def test_convolucion_incremental(tamano_bloque=16, backend="numpy"):
+    kernel = np.array([[0, 2, 0],
+                       [2, 8, 2],
+                       [0, 2, 0]], dtype=np.float32)
+    incremental = convolucion_incremental(kernel, backend, tamano_bloque)
+
+    for t, cuadro in enumerate(video_sintetico()):
+        salida = incremental.procesar(cuadro)
+        print(f"Cuadro {t}: fracción recalculada {incremental.fraccion_recalculada:.3f}")
+
+        assert np.array_equal(salida, filters.convolucion(cuadro, kernel, backend))
+        if t > 0:
+            assert incremental.fraccion_recalculada < 0.25
+
+def test_canny_incremental(tamano_bloque=16, backend="numpy"):
+    incremental = CannyIncremental(50, 150, backend, tamano_bloque)
+
+    for t, cuadro in enumerate(video_sintetico()):
+        bordes = incremental.procesar(cuadro)
+        print(f"Cuadro {t}: fracción recalculada {incremental.fraccion_recalculada:.3f}")
+
+        assert np.array_equal(bordes, filters.canny(cuadro, 50, 150, backend))
+        if t > 0:
+            assert incremental.fraccion_recalculada < 0.25
+
+def test_memoria_acotada(cuadros=30, tamano_bloque=16, backend="numpy"):
+    rng = np.random.default_rng(1)
+    fondo = rng.integers(0, 256, (120, 160, 3), dtype=np.uint8)
+    incremental = CannyIncremental(50, 150, backend, tamano_bloque)
+
+    # Objeto que se mueve y cambia de tamaño: las regiones recalculadas cambian de forma
+    memoria = []
+    for t in range(cuadros):
+        cuadro = fondo.copy()
+        fila, columna = (7 * t) % 100, (11 * t) % 140
+        cuadro[fila:fila + 8 + t % 9, columna:columna + 6 + t % 7] = 255
+        incremental.procesar(cuadro)
+        memoria.append(incremental._workspace.nbytes + incremental.gradientes._workspace.nbytes)
+
+    print(f"Memoria de buffers: {memoria[1]} bytes tras el cuadro 1, {memoria[-1]} bytes al final")
+    assert memoria[-1] == memoria[1]
+
+    incremental.reiniciar()
+    assert incremental._workspace.nbytes == 0 and incremental.gradientes._workspace.nbytes == 0
@@ -0,0 +1,63 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+from cvtools import filters
+from cvtools.paralelo import EjecutorProcesos
+
+def imagen_aleatoria(tamano=(300, 410)):
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (*tamano, 3), dtype=np.uint8)
+
+def bloques_compartidos():
+    # Solo los bloques de SharedMemory (psm_*): el pool también crea semáforos
+    # con nombre (sem.mp-*) al arrancar con spawn o forkserver
+    if not os.path.isdir("/dev/shm"):
+        return set()
+    return {nombre for nombre in os.listdir("/dev/shm") if nombre.startswith("psm_")}
+
+def tile_con_error(region):
+    raise RuntimeError("Fallo simulado en el worker")
+
+def tile_que_muere(region):
+    os._exit(1)
+
+def test_ejecutor(procesos=2, tamano_tile=128, backend="numpy"):
+    imagen_color = imagen_aleatoria()
+    kernel = np.array([[0, 2, 0],
+                       [2, 8, 2],
+                       [0, 2, 0]], dtype=np.float32)
+
+    with EjecutorProcesos(procesos, tamano_tile) as ejecutor:
+        convolucionada = ejecutor.convolucion(imagen_color, kernel, backend)
+        bordes = ejecutor.canny(imagen_color, 50, 150, backend)
+
+    assert np.array_equal(convolucionada, filters.convolucion(imagen_color, kernel, backend))
+    assert np.array_equal(bordes, filters.canny(imagen_color, 50, 150, backend))
+
+def test_limpieza_tras_fallo(procesos=2, tamano_tile=128):
+    imagen_color = imagen_aleatoria()
+    antes = bloques_compartidos()
+
+    with EjecutorProcesos(procesos, tamano_tile) as ejecutor:
+        # Excepción dentro de un worker: se propaga y se liberan los bloques
+        lanzado = False
+        try:
+            ejecutor.mapear(tile_con_error, imagen_color, (0, 0), (3,), np.uint8)
+        except RuntimeError:
+            lanzado = True
+        assert lanzado, "Se esperaba RuntimeError"
+        assert bloques_compartidos() == antes
+
+        # Worker que muere: el pool se rompe, se liberan los bloques y se recrea
+        lanzado = False
+        try:
+            ejecutor.mapear(tile_que_muere, imagen_color, (0, 0), (3,), np.uint8)
+        except BrokenProcessPool:
+            lanzado = True
+        assert lanzado, "Se esperaba BrokenProcessPool"
+        assert bloques_compartidos() == antes
+
+        resultado = ejecutor.convolucion(imagen_color, filters.KERNEL_LAPLACIANO, "numpy")
+        assert np.array_equal(resultado, filters.convolucion(imagen_color, filters.KERNEL_LAPLACIANO, "numpy"))
+
+    assert bloques_compartidos() == antes